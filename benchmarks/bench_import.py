@@ -0,0 +1,164 @@
+"""Measure the import time of the integration and its startup cost.
+
+Every measurement runs in a fresh interpreter with `-X importtime`. The
+modules Home Assistant loads anyway (aiohttp, voluptuous, the core helpers)
+are imported first as a baseline, so only the time added by the integration
+and its own dependencies is reported.
+
+Usage: python benchmarks/bench_import.py [--runs N]
+
+The client stack is measured always. The integration modules are measured
+when Home Assistant is installed. The startup phase imports the client and
+performs the first update of an emulated switch.
+"""
+
+import argparse
+import importlib.util
+import pathlib
+import statistics
+import subprocess
+import sys
+import textwrap
+
+_ROOT = pathlib.Path(__file__).parents[1]
+_PACKAGE_DIR = _ROOT / "custom_components" / "tplink_easy_smart"
+_BENCHMARKS_DIR = _ROOT / "benchmarks"
+
+_CLIENT_BASELINE = ("asyncio", "aiohttp", "yarl")
+_INTEGRATION_BASELINE = _CLIENT_BASELINE + (
+    "voluptuous",
+    "homeassistant.core",
+    "homeassistant.config_entries",
+    "homeassistant.helpers.config_validation",
+    "homeassistant.helpers.update_coordinator",
+    "homeassistant.helpers.entity_platform",
+    "homeassistant.helpers.storage",
+    "homeassistant.components.sensor",
+    "homeassistant.components.binary_sensor",
+    "homeassistant.components.switch",
+    "homeassistant.components.diagnostics",
+)
+_INTEGRATION_MODULES = (
+    "custom_components.tplink_easy_smart",
+    "custom_components.tplink_easy_smart.config_flow",
+    "custom_components.tplink_easy_smart.sensor",
+    "custom_components.tplink_easy_smart.binary_sensor",
+    "custom_components.tplink_easy_smart.switch",
+    "custom_components.tplink_easy_smart.diagnostics",
+)
+
+_STARTUP_SCRIPT = """
+import asyncio, sys, time
+sys.path[:0] = [{benchmarks!r}]
+import emulator
+
+async def main():
+    runners = await emulator.start_switches(1, {port}, emulator.EmulatorConfig(latency=0))
+    started = time.perf_counter()
+    sys.path.insert(0, {package!r})
+    from client.tplink_api import TpLinkApi
+    imported = time.perf_counter()
+    api = TpLinkApi("127.0.0.1", {port}, False, "admin", "admin", False)
+    async with api.snapshot():
+        await asyncio.gather(
+            api.get_device_info(),
+            api.get_port_states(),
+            api.get_poe_state(),
+            api.get_port_poe_states(),
+        )
+    updated = time.perf_counter()
+    await api.disconnect()
+    for runner in runners:
+        await runner.cleanup()
+    print(imported - started, updated - imported, int("json5" in sys.modules))
+
+asyncio.run(main())
+"""
+
+
+def _import_times(baseline: tuple[str, ...], targets: tuple[str, ...]) -> dict:
+    """Return the self import time in seconds of every module the targets add."""
+    code = "; ".join(
+        ["import sys", f"sys.path[:0] = [{str(_ROOT)!r}, {str(_PACKAGE_DIR)!r}]"]
+        + [f"import {module}" for module in baseline]
+        + ["print('--- baseline ---', file=sys.stderr)"]
+        + [f"import {module}" for module in targets]
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    _, _, added = result.stderr.partition("--- baseline ---")
+    times = {}
+    for line in added.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, _, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(self_us) / 1e6
+    return times
+
+
+def _report_imports(
+    title: str, baseline: tuple[str, ...], targets: tuple[str, ...], runs: int
+) -> None:
+    samples = [_import_times(baseline, targets) for _ in range(runs)]
+    totals = [sum(sample.values()) for sample in samples]
+    modules = {}
+    for sample in samples:
+        for name, seconds in sample.items():
+            modules.setdefault(name, []).append(seconds)
+
+    print(f"{title}:")
+    print(f"  added import time, ms: {statistics.median(totals) * 1e3:.1f}")
+    print(f"  added modules:         {statistics.median(map(len, samples)):.0f}")
+    heaviest = sorted(
+        modules.items(), key=lambda item: statistics.median(item[1]), reverse=True
+    )
+    for name, seconds in heaviest[:8]:
+        print(f"    {name:<52}{statistics.median(seconds) * 1e3:>8.2f}")
+
+
+def _report_startup(runs: int, port: int) -> None:
+    script = _STARTUP_SCRIPT.format(
+        benchmarks=str(_BENCHMARKS_DIR), package=str(_PACKAGE_DIR), port=port
+    )
+    imports, updates, json5_loaded = [], [], 0
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", textwrap.dedent(script)],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.split()
+        imports.append(float(output[0]))
+        updates.append(float(output[1]))
+        json5_loaded += int(output[2])
+
+    print("startup (emulated switch):")
+    print(f"  client import, ms:     {statistics.median(imports) * 1e3:.1f}")
+    print(f"  first update, ms:      {statistics.median(updates) * 1e3:.1f}")
+    print(f"  json5 loaded:          {json5_loaded} of {runs} runs")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--port", type=int, default=18090)
+    args = parser.parse_args()
+
+    _report_imports("client", _CLIENT_BASELINE, ("client.tplink_api",), args.runs)
+    if importlib.util.find_spec("homeassistant"):
+        _report_imports(
+            "integration", _INTEGRATION_BASELINE, _INTEGRATION_MODULES, args.runs
+        )
+    else:
+        print("integration: skipped, Home Assistant is not installed")
+    _report_startup(args.runs, args.port)
+
+
+if __name__ == "__main__":
+    main()
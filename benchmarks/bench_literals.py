@@ -0,0 +1,69 @@
+"""Compare the JS literal parser with json5 on switch payloads.
+
+The payloads are synthetic: `pages.py` generates the literals of the
+`info_ds`, `all_info`, `portConfig` and `globalConfig` variables with the
+syntax of the firmware (unquoted keys, newlines inside arrays, quoted strings
+and integer arrays padded with the trunk slots) and random values. They were
+not captured from a switch.
+
+Usage: python benchmarks/bench_literals.py [--number N]
+"""
+
+import argparse
+import pathlib
+import random
+import sys
+import timeit
+
+import json5
+
+sys.path.insert(
+    0, str(pathlib.Path(__file__).parents[1] / "custom_components" / "tplink_easy_smart")
+)
+
+import pages  # noqa: E402
+from client.parser import parse_literal  # noqa: E402
+
+
+def _payloads(port_count: int) -> list[tuple[str, str]]:
+    rng = random.Random(port_count)
+    return [
+        ("info_ds", pages.system_info_literal(port_count)),
+        ("all_info", pages.port_settings_literal(port_count, rng)),
+        ("portConfig", pages.poe_port_config_literal(port_count, rng)),
+        ("globalConfig", pages.poe_global_config_literal(port_count)),
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{'payload':<20}{'bytes':>8}{'json5, us':>12}{'parser, us':>12}{'speedup':>10}")
+    for port_count in pages.PORT_COUNTS:
+        total_json5 = total_parser = 0.0
+        for name, literal in _payloads(port_count):
+            if parse_literal(literal) != json5.loads(literal):
+                raise SystemExit(f"{name}/{port_count}: results differ")
+
+            json5_time = timeit.timeit(lambda: json5.loads(literal), number=args.number)
+            parser_time = timeit.timeit(lambda: parse_literal(literal), number=args.number)
+            total_json5 += json5_time
+            total_parser += parser_time
+            print(
+                f"{name + '/' + str(port_count):<20}{len(literal):>8}"
+                f"{json5_time / args.number * 1e6:>12.1f}"
+                f"{parser_time / args.number * 1e6:>12.1f}"
+                f"{json5_time / parser_time:>9.1f}x"
+            )
+        print(
+            f"{'poll/' + str(port_count):<20}{'':>8}"
+            f"{total_json5 / args.number * 1e6:>12.1f}"
+            f"{total_parser / args.number * 1e6:>12.1f}"
+            f"{total_json5 / total_parser:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""Poll emulated switches with the client stack and report the refresh costs.
+
+The emulator runs in a separate process, so the CPU time reported here is
+spent by the client only.
+
+Usage: python benchmarks/bench_load.py [--switches N] [--cycles N] ...
+"""
+
+import argparse
+import asyncio
+import json
+import pathlib
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+import aiohttp
+
+import emulator
+
+sys.path.insert(
+    0, str(pathlib.Path(__file__).parents[1] / "custom_components" / "tplink_easy_smart")
+)
+
+from client.tplink_api import TpLinkApi  # noqa: E402
+
+
+def _stats_url(port: int) -> str:
+    return f"http://127.0.0.1:{port}/__stats"
+
+
+def _read_stats(ports: list[int], reset: bool = False) -> dict[str, int]:
+    total = {}
+    for port in ports:
+        request = urllib.request.Request(
+            _stats_url(port), method="DELETE" if reset else "GET"
+        )
+        with urllib.request.urlopen(request) as response:
+            for name, count in json.load(response).items():
+                total[name] = total.get(name, 0) + count
+    return total
+
+
+def _wait_for_emulator(ports: list[int], timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            _read_stats(ports)
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+
+async def _refresh(api: TpLinkApi) -> None:
+    """Fetch the same data as the update coordinator does."""
+    async with api.snapshot():
+        results = await asyncio.gather(
+            api.get_device_info(),
+            api.get_port_states(),
+            api.get_poe_state(),
+            api.get_port_poe_states(),
+            return_exceptions=True,
+        )
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+
+
+async def _timed_refresh(api: TpLinkApi, latencies: list[float]) -> None:
+    started = time.perf_counter()
+    await _refresh(api)
+    latencies.append(time.perf_counter() - started)
+
+
+def _percentile(values: list[float], percent: int) -> float:
+    return statistics.quantiles(values, n=100, method="inclusive")[percent - 1]
+
+
+async def _run(args: argparse.Namespace, ports: list[int]) -> None:
+    session_factory = None
+    connector = None
+    if args.shared_connector:
+        connector = aiohttp.TCPConnector(ttl_dns_cache=300)
+
+        def session_factory(cookie_jar: aiohttp.CookieJar) -> aiohttp.ClientSession:
+            return aiohttp.ClientSession(
+                connector=connector, connector_owner=False, cookie_jar=cookie_jar
+            )
+
+    apis = [
+        TpLinkApi(
+            host="127.0.0.1",
+            port=port,
+            use_ssl=False,
+            user="admin",
+            password="admin",
+            verify_ssl=False,
+            max_concurrency=args.concurrency,
+            session_factory=session_factory,
+        )
+        for port in ports
+    ]
+    try:
+        # the first refresh authenticates and detects the features
+        await asyncio.gather(*(_refresh(api) for api in apis))
+        _read_stats(ports, reset=True)
+
+        latencies = []
+        cpu_started = time.process_time()
+        wall_started = time.perf_counter()
+        for _ in range(args.cycles):
+            await asyncio.gather(*(_timed_refresh(api, latencies) for api in apis))
+            if args.interval:
+                await asyncio.sleep(args.interval)
+        wall_time = time.perf_counter() - wall_started
+        cpu_time = time.process_time() - cpu_started
+    finally:
+        for api in apis:
+            await api.disconnect()
+        if connector:
+            await connector.close()
+
+    stats = _read_stats(ports)
+    polls = args.cycles * len(apis)
+    requests = sum(count for name, count in stats.items() if name != "unauthorized")
+    print(f"switches:            {len(apis)} x {args.ports} ports")
+    print(f"polls:               {polls} in {wall_time:.2f}s")
+    print(f"refresh p50, ms:     {_percentile(latencies, 50) * 1e3:.1f}")
+    print(f"refresh p95, ms:     {_percentile(latencies, 95) * 1e3:.1f}")
+    print(f"requests per cycle:  {requests / polls:.2f}")
+    print(f"re-auths per cycle:  {stats.get('POST logon.cgi', 0) / polls:.2f}")
+    print(f"CPU per poll, ms:    {cpu_time / polls * 1e3:.2f}")
+    if args.verbose:
+        for name, count in sorted(stats.items()):
+            print(f"  {name:<28}{count / polls:>8.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--switches", type=int, default=4)
+    parser.add_argument("--cycles", type=int, default=50)
+    parser.add_argument(
+        "--interval", type=float, default=0.0, help="seconds between the cycles"
+    )
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument(
+        "--shared-connector",
+        action="store_true",
+        help="share one connector between the switches like the integration does",
+    )
+    parser.add_argument("--base-port", type=int, default=18080)
+    parser.add_argument("--verbose", action="store_true")
+    emulator.add_config_arguments(parser)
+    args = parser.parse_args()
+
+    ports = [args.base_port + index for index in range(args.switches)]
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            str(pathlib.Path(__file__).with_name("emulator.py")),
+            f"--switches={args.switches}",
+            f"--base-port={args.base_port}",
+            f"--ports={args.ports}",
+            f"--poe-ports={args.poe_ports}",
+            f"--latency={args.latency}",
+            f"--session-timeout={args.session_timeout}",
+            f"--login-slots={args.login_slots}",
+        ],
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        _wait_for_emulator(ports)
+        asyncio.run(_run(args, ports))
+    finally:
+        process.terminate()
+        process.wait()
+
+
+if __name__ == "__main__":
+    main()
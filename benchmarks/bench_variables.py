@@ -0,0 +1,85 @@
+"""Compare the page variables extractor with the former regex implementation.
+
+The pages are synthetic: they are generated by `pages.py` to model the
+firmware layout, see there for what they do and do not reproduce.
+
+Usage: python benchmarks/bench_variables.py [--number N]
+"""
+
+import argparse
+import pathlib
+import re
+import sys
+import timeit
+
+sys.path.insert(
+    0, str(pathlib.Path(__file__).parents[1] / "custom_components" / "tplink_easy_smart")
+)
+
+import pages  # noqa: E402
+from client.parser import extract_variables  # noqa: E402
+
+_LEGACY_SCRIPT_REGEX = r".*<script>(.*)<\/script>"
+_LEGACY_VARIABLES_REGEX = (
+    r".*var\s+(?P<variable>[a-zA-Z0-9_]+)\s*=\s*(?P<value>[^;]+);\s*"
+)
+
+
+def legacy_get_variables(page: str) -> dict[str, str]:
+    """The implementation used before the dedicated extractor."""
+    result = {}
+    script_match = re.match(_LEGACY_SCRIPT_REGEX, page, re.RegexFlag.DOTALL)
+    if not script_match:
+        return result
+    for variable_match in re.finditer(_LEGACY_VARIABLES_REGEX, script_match.group(0)):
+        result[variable_match.group("variable")] = variable_match.group("value")
+    return result
+
+
+def legacy_check_and_extract(page: str) -> dict[str, str]:
+    """Former GET path: one parse for the auth check, one for the variables."""
+    legacy_get_variables(page).get("logonInfo")
+    return legacy_get_variables(page)
+
+
+def check_and_extract(page: str) -> dict[str, str]:
+    """Current GET path: the auth check reuses the extracted variables."""
+    variables = extract_variables(page)
+    variables.get("logonInfo")
+    return variables
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'page':<24}{'bytes':>8}{'legacy, us':>14}{'current, us':>14}{'speedup':>10}")
+    for port_count in pages.PORT_COUNTS:
+        for name, page in (
+            ("SystemInfoRpm", pages.system_info_page(port_count)),
+            ("PortSettingRpm", pages.port_settings_page(port_count)),
+            ("PoeConfigRpm", pages.poe_config_page(port_count)),
+        ):
+            legacy = {
+                key: value.strip() for key, value in legacy_get_variables(page).items()
+            }
+            if legacy != extract_variables(page):
+                raise SystemExit(f"{name}/{port_count}: results differ")
+
+            legacy_time = timeit.timeit(
+                lambda: legacy_check_and_extract(page), number=args.number
+            )
+            current_time = timeit.timeit(
+                lambda: check_and_extract(page), number=args.number
+            )
+            print(
+                f"{name + '/' + str(port_count):<24}{len(page):>8}"
+                f"{legacy_time / args.number * 1e6:>14.1f}"
+                f"{current_time / args.number * 1e6:>14.1f}"
+                f"{legacy_time / current_time:>9.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
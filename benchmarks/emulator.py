@@ -0,0 +1,342 @@
+"""Emulator of the Easy Smart switch web interface.
+
+Serves the pages and the setters used by the integration with the same
+variables and the same session behaviour as the switch firmware, so the client
+stack can be measured without any hardware attached.
+
+Usage: python benchmarks/emulator.py [--switches N] [--base-port PORT] ...
+
+Every emulated switch listens on its own port starting from `--base-port`.
+`GET /__stats` returns the request counters of a switch, `DELETE /__stats`
+resets them.
+"""
+
+import argparse
+import asyncio
+from dataclasses import dataclass
+import random
+import secrets
+import time
+
+from aiohttp import web
+
+import pages
+
+SESSION_COOKIE = "H_P_SSID"
+
+LOGON_SUCCESS = 0
+LOGON_INVALID_CREDENTIALS = 1
+LOGON_TOO_MANY_USERS = 4
+LOGON_SESSION_TIMEOUT = 5
+
+# poe_port_config.cgi values to portConfig values
+_POE_STATES = {"1": 0, "2": 1}
+_POE_PRIORITIES = {"1": 0, "2": 1, "3": 2}
+_POE_POWER_LIMITS = {"1": 330, "2": 40, "3": 70, "4": 154, "5": 300}
+
+
+# ---------------------------
+#   EmulatorConfig
+# ---------------------------
+@dataclass
+class EmulatorConfig:
+    port_count: int = 8
+    poe_port_count: int = 4
+    latency: float = 0.02
+    session_timeout: float = 600.0
+    login_slots: int = 16
+    username: str = "admin"
+    password: str = "admin"
+
+
+# ---------------------------
+#   EmulatedSwitch
+# ---------------------------
+class EmulatedSwitch:
+    """State and request handlers of a single switch."""
+
+    def __init__(self, config: EmulatorConfig, seed: int = 0) -> None:
+        """Initialize."""
+        self._config = config
+        rng = random.Random(seed)
+        size = config.port_count + 2  # the firmware pads the arrays with trunk slots
+        self._ports = {
+            "state": [1] * size,
+            "trunk_info": [0] * size,
+            "spd_cfg": [1] * size,
+            "spd_act": [rng.choice((0, 5, 6)) for _ in range(size)],
+            "fc_cfg": [0] * size,
+            "fc_act": [0] * size,
+        }
+        poe_ports = range(config.poe_port_count)
+        self._poe_ports = {
+            "state": [1 for _ in poe_ports],
+            "priority": [0 for _ in poe_ports],
+            "powerlimit": [330 for _ in poe_ports],
+            "power": [rng.randint(0, 150) for _ in poe_ports],
+            "current": [rng.randint(0, 300) for _ in poe_ports],
+            "voltage": [rng.choice((0, 532)) for _ in poe_ports],
+            "pdclass": [rng.choice((40, 154, 330)) for _ in poe_ports],
+            "powerstatus": [rng.choice((0, 2)) for _ in poe_ports],
+        }
+        self._poe_limit = config.poe_port_count * 150
+        # packets per second sent and received by every port
+        self._packet_rates = [
+            (rng.randint(0, 5000), rng.randint(0, 5000)) if speed else (0, 0)
+            for speed in self._ports["spd_act"][: config.port_count]
+        ]
+        self._started_at = time.monotonic()
+        self._sessions: dict[str, float] = {}
+        self.stats: dict[str, int] = {}
+
+    def _count(self, name: str) -> None:
+        self.stats[name] = self.stats.get(name, 0) + 1
+
+    def _expire_sessions(self) -> None:
+        deadline = time.monotonic() - self._config.session_timeout
+        for token, last_seen in list(self._sessions.items()):
+            if last_seen < deadline:
+                del self._sessions[token]
+
+    def _is_authorized(self, request: web.Request) -> bool:
+        self._expire_sessions()
+        token = request.cookies.get(SESSION_COOKIE)
+        if token not in self._sessions:
+            return False
+        self._sessions[token] = time.monotonic()
+        return True
+
+    @staticmethod
+    def _html(page: str) -> web.Response:
+        return web.Response(text=page, content_type="text/html")
+
+    def _port_settings_page(self) -> str:
+        info = ",\n".join(
+            f"{name}:[{pages.int_list(values)}]" for name, values in self._ports.items()
+        )
+        script = (
+            f"var max_port_num = {self._config.port_count};\n"
+            "var port_middle_num  = 16;\n"
+            f"var all_info = {{\n{info}\n}};\n"
+            'var tip = "";\n'
+        )
+        return pages.render_page(self._config.port_count, script)
+
+    def _port_statistics_page(self) -> str:
+        elapsed = time.monotonic() - self._started_at
+        counters = []
+        for tx_rate, rx_rate in self._packet_rates:
+            # the firmware counters are 32 bits wide
+            counters += [int(tx_rate * elapsed) % (1 << 32), 0]
+            counters += [int(rx_rate * elapsed) % (1 << 32), 0]
+        counters += [0] * 8  # trunk slots
+        size = self._config.port_count + 2
+        script = (
+            f"var max_port_num = {self._config.port_count};\n"
+            "var port_middle_num  = 16;\n"
+            "var all_info = {\n"
+            f"state:[{pages.int_list(self._ports['state'])}],\n"
+            f"link_status:[{pages.int_list(self._ports['spd_act'][:size])}],\n"
+            f"pkts:[{pages.int_list(counters)}]\n"
+            "};\n"
+            'var tip = "";\n'
+        )
+        return pages.render_page(self._config.port_count, script)
+
+    def _poe_config_page(self) -> str:
+        config = ",\n".join(
+            f"{name}:[{pages.int_list(values)}]"
+            for name, values in self._poe_ports.items()
+        )
+        consumption = sum(self._poe_ports["power"])
+        script = (
+            f"var poe_port_num = {self._config.poe_port_count};\n"
+            f"var portConfig = {{\n{config}\n}};\n"
+            "var globalConfig = {\n"
+            f"system_power_limit:{self._poe_limit},\n"
+            f"system_power_consumption:{consumption},\n"
+            f"system_power_remain:{self._poe_limit - consumption},\n"
+            "system_power_limit_min:10,\n"
+            f"system_power_limit_max:{self._config.poe_port_count * 150}\n"
+            "};\n"
+            'var tip = "";\n'
+        )
+        return pages.render_page(self._config.port_count, script)
+
+    async def _logon(self, request: web.Request) -> web.Response:
+        data = await request.post()
+        if (
+            data.get("username") != self._config.username
+            or data.get("password") != self._config.password
+        ):
+            return self._html(pages.logon_page(LOGON_INVALID_CREDENTIALS))
+
+        self._expire_sessions()
+        self._sessions.pop(request.cookies.get(SESSION_COOKIE), None)
+        if len(self._sessions) >= self._config.login_slots:
+            return self._html(pages.logon_page(LOGON_TOO_MANY_USERS))
+
+        token = secrets.token_hex(8)
+        self._sessions[token] = time.monotonic()
+        response = self._html(pages.logon_page(LOGON_SUCCESS))
+        response.set_cookie(SESSION_COOKIE, token)
+        return response
+
+    def _set_port_settings(self, request: web.Request) -> web.Response:
+        query = request.query
+        state = int(query["state"])
+        speed = int(query["speed"])
+        flow_control = int(query["flowcontrol"])
+        for port_id in query.getall("portid"):
+            index = int(port_id) - 1
+            self._ports["state"][index] = state
+            self._ports["spd_cfg"][index] = speed
+            self._ports["fc_cfg"][index] = flow_control
+            if not state:
+                self._ports["spd_act"][index] = 0
+        return self._html(self._port_settings_page())
+
+    async def _set_poe_settings(self, request: web.Request) -> web.Response:
+        data = await request.post()
+        self._poe_limit = int(float(data["name_powerlimit"]) * 10)
+        return self._html(self._poe_config_page())
+
+    async def _set_poe_port_settings(self, request: web.Request) -> web.Response:
+        data = await request.post()
+        for number in range(1, self._config.poe_port_count + 1):
+            if data.get(f"sel_{number}") != "1":
+                continue
+            index = number - 1
+            ports = self._poe_ports
+            ports["state"][index] = _POE_STATES[data["name_pstate"]]
+            ports["priority"][index] = _POE_PRIORITIES[data["name_ppriority"]]
+            if data["name_ppowerlimit"] == "6":
+                limit = int(float(data["name_ppowerlimit2"]) * 10)
+            else:
+                limit = _POE_POWER_LIMITS[data["name_ppowerlimit"]]
+            ports["powerlimit"][index] = limit
+        return self._html(self._poe_config_page())
+
+    async def handle(self, request: web.Request) -> web.StreamResponse:
+        """Serve a request like the switch firmware does."""
+        path = request.match_info["path"]
+        if path == "__stats":
+            if request.method == "DELETE":
+                self.stats = {}
+            return web.json_response(self.stats)
+
+        self._count(f"{request.method} {path}")
+        await asyncio.sleep(self._config.latency)
+
+        if path == "logon.cgi":
+            return await self._logon(request)
+
+        if not self._is_authorized(request):
+            self._count("unauthorized")
+            return self._html(pages.logon_page(LOGON_SESSION_TIMEOUT))
+
+        if path == "SystemInfoRpm.htm":
+            return self._html(pages.system_info_page(self._config.port_count))
+        if path == "PortSettingRpm.htm":
+            return self._html(self._port_settings_page())
+        if path == "port_setting.cgi":
+            return self._set_port_settings(request)
+        if path == "PortStatisticsRpm.htm":
+            return self._html(self._port_statistics_page())
+
+        if self._config.poe_port_count:
+            if path == "PoeConfigRpm.htm":
+                return self._html(self._poe_config_page())
+            if path == "poe_global_config.cgi":
+                return await self._set_poe_settings(request)
+            if path == "poe_port_config.cgi":
+                return await self._set_poe_port_settings(request)
+
+        # the firmware drops the connection on unknown pages
+        request.transport.close()
+        return web.Response()
+
+
+# ---------------------------
+#   start_switches
+# ---------------------------
+async def start_switches(
+    count: int, base_port: int, config: EmulatorConfig, host: str = "127.0.0.1"
+) -> list[web.AppRunner]:
+    """Start `count` switches listening on consecutive ports."""
+    runners = []
+    for index in range(count):
+        switch = EmulatedSwitch(config, seed=index)
+        app = web.Application()
+        app.router.add_route("*", "/{path:.*}", switch.handle)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, host, base_port + index).start()
+        runners.append(runner)
+    return runners
+
+
+def add_config_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the emulated switch options to the command line parser."""
+    defaults = EmulatorConfig()
+    parser.add_argument("--ports", type=int, default=defaults.port_count)
+    parser.add_argument("--poe-ports", type=int, default=defaults.poe_port_count)
+    parser.add_argument(
+        "--latency", type=float, default=defaults.latency, help="seconds per request"
+    )
+    parser.add_argument(
+        "--session-timeout",
+        type=float,
+        default=defaults.session_timeout,
+        help="seconds of inactivity after which a session expires",
+    )
+    parser.add_argument(
+        "--login-slots",
+        type=int,
+        default=defaults.login_slots,
+        help="number of sessions a switch accepts at the same time",
+    )
+
+
+def config_from_arguments(args: argparse.Namespace) -> EmulatorConfig:
+    """Return the emulated switch options given in the command line."""
+    return EmulatorConfig(
+        port_count=args.ports,
+        poe_port_count=min(args.poe_ports, args.ports),
+        latency=args.latency,
+        session_timeout=args.session_timeout,
+        login_slots=args.login_slots,
+    )
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    runners = await start_switches(
+        args.switches, args.base_port, config_from_arguments(args), args.host
+    )
+    print(
+        f"Serving {args.switches} switch(es) at "
+        f"http://{args.host}:{args.base_port}-{args.base_port + args.switches - 1}"
+    )
+    try:
+        await asyncio.Event().wait()
+    finally:
+        for runner in runners:
+            await runner.cleanup()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--switches", type=int, default=1)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--base-port", type=int, default=18080)
+    add_config_arguments(parser)
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
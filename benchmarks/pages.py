@@ -0,0 +1,164 @@
+"""Synthetic Easy Smart web pages used by the benchmarks.
+
+These are not pages captured from a switch: no capture was available, so the
+pages are generated. They reproduce the layout served by the switch firmware:
+a head with the `<script>` block that declares the page variables, followed by
+the HTML body with forms and tables that the integration never reads. The
+variables use the names, literal syntax and array sizes (with the trunk slots)
+of the firmware, the values are random but valid. The body grows with the
+number of ports, like the port tables of the real pages.
+
+Timings measured on these pages show the relative cost of the parsers; the
+absolute numbers on real pages may differ with the firmware version.
+"""
+
+import random
+
+_HEAD = """<!DOCTYPE html>
+<html>
+<head>
+<meta http-equiv="Content-Type" content="text/html; charset=utf-8">
+<meta http-equiv="pragma" content="no-cache">
+<link rel="stylesheet" href="../css/style.css" type="text/css">
+<script type="text/javascript" src="../js/tplink.js"></script>
+<script>
+"""
+
+_TAIL_ROW = (
+    '<tr><td class="TABLE_HEAD_BOTTOM" align="center">{number}</td>'
+    '<td class="TABLE_HEAD_BOTTOM" align="center"><span id="port_{number}_state">'
+    "</span></td><td class=\"TABLE_HEAD_BOTTOM\" align=\"center\">"
+    '<input type="checkbox" name="sel_{number}" value="1" '
+    'onclick="javascript:doSelect({number});"></td></tr>\n'
+)
+
+_TAIL = """</script>
+</head>
+<body onload="javascript:doLoad();">
+<form name="port_setting" action="port_setting.cgi" method="get">
+<table class="BORDER" cellspacing="0" cellpadding="0" width="100%">
+<tr><td class="TABLE_HEAD_BOTTOM" align="center">Port</td>
+<td class="TABLE_HEAD_BOTTOM" align="center">Status</td>
+<td class="TABLE_HEAD_BOTTOM" align="center">Select</td></tr>
+{rows}</table>
+<input type="submit" name="apply" value="Apply" class="BUTTON">
+<input type="button" value="Help" class="BUTTON" onclick="javascript:showHelp();">
+</form>
+<script>
+function doLoad() {{ for (var i = 1; i <= max_port_num; i++) {{ refreshPort(i); }} }}
+</script>
+</body>
+</html>
+"""
+
+PORT_COUNTS = (5, 8, 16, 24)
+
+
+def int_list(values) -> str:
+    return ",".join(str(value) for value in values)
+
+
+def render_page(port_count: int, script: str) -> str:
+    """Wrap the script block into a page with a table of `port_count` rows."""
+    rows = "".join(_TAIL_ROW.format(number=n) for n in range(1, port_count + 1))
+    return _HEAD + script + _TAIL.format(rows=rows)
+
+
+def system_info_page(port_count: int = 8) -> str:
+    """Return SystemInfoRpm.htm."""
+    script = (
+        "var info_ds = {\n"
+        'descriStr:[\n"TL-SG1%02dPE"\n],\n'
+        'macStr:[\n"AA-BB-CC-DD-EE-%02X"\n],\n'
+        'ipStr:[\n"192.168.0.%d"\n],\n'
+        'netmaskStr:[\n"255.255.255.0"\n],\n'
+        'gatewayStr:[\n"192.168.0.1"\n],\n'
+        'firmwareStr:[\n"1.0.0 Build 20230218 Rel.50633"\n],\n'
+        'hardwareStr:[\n"TL-SG1%02dPE 3.0"\n]\n'
+        "};\n"
+        'var tip = "";\n'
+    ) % (port_count, port_count, port_count + 10, port_count)
+    return render_page(port_count, script)
+
+
+def port_settings_literal(port_count: int, rng: random.Random) -> str:
+    """Return the `all_info` literal of PortSettingRpm.htm."""
+    size = port_count + 2  # the firmware pads the arrays with trunk slots
+    return (
+        "{\n"
+        f"state:[{int_list(rng.choice((0, 1, 1, 1)) for _ in range(size))}],\n"
+        f"trunk_info:[{int_list(0 for _ in range(size))}],\n"
+        f"spd_cfg:[{int_list(rng.choice((1, 1, 5, 6)) for _ in range(size))}],\n"
+        f"spd_act:[{int_list(rng.choice((0, 5, 6)) for _ in range(size))}],\n"
+        f"fc_cfg:[{int_list(rng.choice((0, 1)) for _ in range(size))}],\n"
+        f"fc_act:[{int_list(rng.choice((0, 1)) for _ in range(size))}]\n"
+        "}"
+    )
+
+
+def port_settings_page(port_count: int = 8, seed: int = 0) -> str:
+    """Return PortSettingRpm.htm."""
+    rng = random.Random(seed)
+    script = (
+        f"var max_port_num = {port_count};\n"
+        "var port_middle_num  = 16;\n"
+        f"var all_info = {port_settings_literal(port_count, rng)};\n"
+        'var tip = "";\n'
+    )
+    return render_page(port_count, script)
+
+
+def poe_port_config_literal(port_count: int, rng: random.Random) -> str:
+    """Return the `portConfig` literal of PoeConfigRpm.htm."""
+    ports = range(port_count)
+    return (
+        "{\n"
+        f"state:[{int_list(rng.choice((1, 2)) for _ in ports)}],\n"
+        f"priority:[{int_list(rng.choice((0, 1, 2)) for _ in ports)}],\n"
+        f"powerlimit:[{int_list(rng.choice((330, 40, 154, 125)) for _ in ports)}],\n"
+        f"power:[{int_list(rng.randint(0, 300) for _ in ports)}],\n"
+        f"current:[{int_list(rng.randint(0, 600) for _ in ports)}],\n"
+        f"voltage:[{int_list(rng.choice((0, 532, 534)) for _ in ports)}],\n"
+        f"pdclass:[{int_list(rng.choice((40, 154, 300, 330)) for _ in ports)}],\n"
+        f"powerstatus:[{int_list(rng.choice((0, 2)) for _ in ports)}]\n"
+        "}"
+    )
+
+
+def poe_global_config_literal(port_count: int) -> str:
+    """Return the `globalConfig` literal of PoeConfigRpm.htm."""
+    limit = port_count * 150
+    return (
+        "{\n"
+        f"system_power_limit:{limit},\n"
+        "system_power_consumption:723,\n"
+        f"system_power_remain:{limit - 723},\n"
+        "system_power_limit_min:10,\n"
+        f"system_power_limit_max:{limit}\n"
+        "}"
+    )
+
+
+def poe_config_page(port_count: int = 8, seed: int = 0) -> str:
+    """Return PoeConfigRpm.htm."""
+    rng = random.Random(seed)
+    script = (
+        f"var poe_port_num = {port_count};\n"
+        f"var portConfig = {poe_port_config_literal(port_count, rng)};\n"
+        f"var globalConfig = {poe_global_config_literal(port_count)};\n"
+        'var tip = "";\n'
+    )
+    return render_page(port_count, script)
+
+
+def logon_page(code: int = 0) -> str:
+    """Return the logon.cgi response (and the page served to unauthorized clients)."""
+    script = f"var logonInfo = new Array(\n{code},\n0,0);\n"
+    return render_page(0, script)
+
+
+def system_info_literal(port_count: int) -> str:
+    """Return the `info_ds` literal of SystemInfoRpm.htm."""
+    page = system_info_page(port_count)
+    start = page.index("{", page.index("var info_ds"))
+    return page[start : page.index("};", start) + 1]
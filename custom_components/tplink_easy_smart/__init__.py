@@ -1,21 +1,27 @@
 """TP-Link Easy Smart integration."""
 
+import asyncio
+from functools import partial
 import logging
 
-from homeassistant.config_entries import ConfigEntry
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers import config_validation
 
 from .const import (
-    DATA_KEY_COORDINATOR,
+    CONF_CAPABILITIES,
+    DATA_KEY_FIRST_REFRESH,
+    DATA_KEY_SETTINGS,
     DEFAULT_POE_STATE_SWITCHES,
     DOMAIN,
+    FIRST_REFRESH_DEADLINE,
     OPT_POE_STATE_SWITCHES,
     PLATFORMS,
 )
 from .helpers import pop_coordinator, set_coordinator
 from .services import async_setup_services, async_unload_services
-from .update_coordinator import TpLinkDataUpdateCoordinator
+from .update_coordinator import TpLinkDataUpdateCoordinator, get_session_store
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -36,17 +42,15 @@ async def async_setup(hass, _config):
 # ---------------------------
 async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
     """Set up TP-Link as config entry."""
-    coordinator = TpLinkDataUpdateCoordinator(hass, config_entry)
-    hass.data.setdefault(DOMAIN, {}).setdefault(config_entry.entry_id, {})[
-        DATA_KEY_COORDINATOR
-    ] = coordinator
-
-    await coordinator.async_config_entry_first_refresh()
+    coordinator = await _async_first_refresh(hass, config_entry)
 
     config_entry.async_on_unload(config_entry.add_update_listener(update_listener))
     config_entry.async_on_unload(coordinator.async_unload)
 
     set_coordinator(hass, config_entry, coordinator)
+    hass.data[DOMAIN][config_entry.entry_id][DATA_KEY_SETTINGS] = _get_settings(
+        config_entry
+    )
 
     await hass.config_entries.async_forward_entry_setups(config_entry, PLATFORMS)
 
@@ -54,11 +58,120 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> b
     return True
 
 
+# ---------------------------
+#   _get_settings
+# ---------------------------
+def _get_settings(config_entry: ConfigEntry) -> tuple[dict, dict]:
+    """Return the entry configuration, without the capabilities detected from the switch."""
+    data = dict(config_entry.data)
+    data.pop(CONF_CAPABILITIES, None)
+    return data, dict(config_entry.options)
+
+
+# ---------------------------
+#   _async_first_refresh
+# ---------------------------
+async def _async_first_refresh(
+    hass: HomeAssistant, config_entry: ConfigEntry
+) -> TpLinkDataUpdateCoordinator:
+    """Return the coordinator once it is updated, waiting no longer than the deadline.
+
+    The update exceeding the deadline goes on in the background, so the other
+    switches are not held up, and is picked up by the next setup attempt. The
+    coordinator of the failed attempt is shut down with it, so the next attempt
+    takes its session and data over with a new coordinator.
+    """
+    entry_data = hass.data.setdefault(DOMAIN, {}).setdefault(config_entry.entry_id, {})
+    config = _get_settings(config_entry)
+    pending = entry_data.get(DATA_KEY_FIRST_REFRESH)
+    if pending and pending[0] != config:
+        _LOGGER.debug("Configuration changed, dropping the pending first update")
+        await _async_drop_first_refresh(hass, config_entry.entry_id)
+        pending = None
+
+    is_started_now = not pending
+    if is_started_now:
+        coordinator = TpLinkDataUpdateCoordinator(hass, config_entry)
+        await coordinator.async_restore_session()
+        task = hass.async_create_background_task(
+            coordinator.async_config_entry_first_refresh(),
+            f"{DOMAIN} first update of {config_entry.title}",
+        )
+        task.add_done_callback(
+            partial(_first_refresh_done, hass, config_entry.entry_id)
+        )
+        pending = entry_data[DATA_KEY_FIRST_REFRESH] = (config, coordinator, task)
+
+    _, coordinator, task = pending
+    try:
+        await asyncio.wait_for(asyncio.shield(task), FIRST_REFRESH_DEADLINE)
+    except TimeoutError as ex:
+        raise ConfigEntryNotReady(
+            f"The first update is taking longer than {FIRST_REFRESH_DEADLINE}s, "
+            "continuing in the background"
+        ) from ex
+    except Exception:
+        del entry_data[DATA_KEY_FIRST_REFRESH]
+        await coordinator.async_unload()
+        raise
+    del entry_data[DATA_KEY_FIRST_REFRESH]
+    if is_started_now:
+        return coordinator
+
+    result = TpLinkDataUpdateCoordinator(hass, config_entry)
+    result.take_over(coordinator)
+    return result
+
+
+# ---------------------------
+#   _async_drop_first_refresh
+# ---------------------------
+async def _async_drop_first_refresh(
+    hass: HomeAssistant, entry_id: str, task: asyncio.Task | None = None
+) -> None:
+    """Cancel the pending first update of the entry and release its coordinator."""
+    entry_data = hass.data.get(DOMAIN, {}).get(entry_id, {})
+    pending = entry_data.get(DATA_KEY_FIRST_REFRESH)
+    if not pending or (task is not None and pending[2] is not task):
+        return
+    del entry_data[DATA_KEY_FIRST_REFRESH]
+    pending[2].cancel()
+    await pending[1].async_unload()
+
+
+# ---------------------------
+#   _first_refresh_done
+# ---------------------------
+def _first_refresh_done(hass: HomeAssistant, entry_id: str, task: asyncio.Task) -> None:
+    """Set up the entry waiting for the first update finished in the background."""
+    if task.cancelled():
+        return
+    is_updated = task.exception() is None
+    config_entry = hass.config_entries.async_get_entry(entry_id)
+    state = config_entry.state if config_entry else None
+    if state is ConfigEntryState.SETUP_IN_PROGRESS:
+        # the setup attempt waiting for the update picks it up
+        return
+    if is_updated and state is ConfigEntryState.SETUP_RETRY:
+        _LOGGER.debug("First update of %s finished, setting up", config_entry.title)
+        hass.config_entries.async_schedule_reload(entry_id)
+        return
+
+    # the update failed, or the entry was removed or disabled meanwhile
+    hass.async_create_task(
+        _async_drop_first_refresh(hass, entry_id, task),
+        f"{DOMAIN} drop first update",
+    )
+
+
 # ---------------------------
 #   update_listener
 # ---------------------------
 async def update_listener(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
-    """Update listener."""
+    """Reload the entry unless only the stored capabilities have changed."""
+    entry_data = hass.data.get(DOMAIN, {}).get(config_entry.entry_id, {})
+    if entry_data.get(DATA_KEY_SETTINGS) == _get_settings(config_entry):
+        return
     await hass.config_entries.async_reload(config_entry.entry_id)
 
 
@@ -86,6 +199,15 @@ async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry) ->
     return unload_ok
 
 
+# ---------------------------
+#   async_remove_entry
+# ---------------------------
+async def async_remove_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+    """Remove the data stored for the entry."""
+    await _async_drop_first_refresh(hass, config_entry.entry_id)
+    await get_session_store(hass, config_entry.entry_id).async_remove()
+
+
 async def async_migrate_entry(hass, config_entry: ConfigEntry):
     """Migrate old entry."""
     _LOGGER.debug("Migrating from version %s", config_entry.version)
@@ -28,7 +28,12 @@ from .helpers import (
     generate_entity_unique_id,
     get_coordinator,
 )
-from .update_coordinator import TpLinkDataUpdateCoordinator
+from .update_coordinator import (
+    LISTENER_KIND_PORT_POE_STATE,
+    LISTENER_KIND_PORT_STATE,
+    TpLinkDataUpdateCoordinator,
+    TpLinkPortListenerContext,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -134,9 +139,10 @@ class TpLinkBinarySensor(
         self,
         coordinator: TpLinkDataUpdateCoordinator,
         description: TpLinkBinarySensorEntityDescription,
+        context: TpLinkPortListenerContext | None = None,
     ) -> None:
         """Initialize."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context)
         self.entity_description = description
         self._attr_device_info = coordinator.get_device_info()
         self._attr_unique_id = generate_entity_unique_id(
@@ -172,7 +178,15 @@ class TpLinkPortStateBinarySensor(TpLinkBinarySensor):
         description: TpLinkPortBinarySensorEntityDescription,
     ) -> None:
         """Initialize."""
-        super().__init__(coordinator, description)
+        super().__init__(
+            coordinator,
+            description,
+            TpLinkPortListenerContext(
+                LISTENER_KIND_PORT_STATE,
+                description.port_number,
+                frozenset({"enabled", "speed_actual", "speed_config"}),
+            ),
+        )
         self._attr_extra_state_attributes = {}
         self._port_number = description.port_number
 
@@ -213,7 +227,13 @@ class TpLinkPortPoeStateBinarySensor(TpLinkBinarySensor):
         description: TpLinkPortBinarySensorEntityDescription,
     ) -> None:
         """Initialize."""
-        super().__init__(coordinator, description)
+        super().__init__(
+            coordinator,
+            description,
+            TpLinkPortListenerContext(
+                LISTENER_KIND_PORT_POE_STATE, description.port_number
+            ),
+        )
         self._attr_extra_state_attributes = {}
         self._port_number = description.port_number
 
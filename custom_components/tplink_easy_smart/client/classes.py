@@ -1,8 +1,9 @@
 """TP-Link core classes."""
 
+from array import array
 from dataclasses import dataclass
 from enum import IntEnum
-from typing import TypeAlias
+from typing import Final, Iterable, Iterator, TypeAlias
 
 MAC_ADDR: TypeAlias = str
 
@@ -21,6 +22,41 @@ class TpLinkSystemInfo:
     hardware: str | None = None
 
 
+# ---------------------------
+#   TpLinkCapabilities
+# ---------------------------
+@dataclass(frozen=True)
+class TpLinkCapabilities:
+    """Features and ports of the switch, they only change with the firmware."""
+
+    mac: str | None
+    firmware: str | None
+    features: frozenset[str]
+    ports_count: int
+    poe_ports_count: int
+
+    def as_dict(self) -> dict:
+        """Return the capabilities as a JSON serializable dict."""
+        return {
+            "mac": self.mac,
+            "firmware": self.firmware,
+            "features": sorted(self.features),
+            "ports_count": self.ports_count,
+            "poe_ports_count": self.poe_ports_count,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TpLinkCapabilities":
+        """Return the capabilities stored with as_dict."""
+        return cls(
+            mac=data["mac"],
+            firmware=data["firmware"],
+            features=frozenset(data["features"]),
+            ports_count=data["ports_count"],
+            poe_ports_count=data["poe_ports_count"],
+        )
+
+
 # ---------------------------
 #   PortSpeed
 # ---------------------------
@@ -35,6 +71,9 @@ class PortSpeed(IntEnum):
     UNKNOWN = 7
 
 
+_PORT_SPEEDS: dict[int, PortSpeed] = {speed.value: speed for speed in PortSpeed}
+
+
 # ---------------------------
 #   PoePriority
 # ---------------------------
@@ -45,9 +84,7 @@ class PoePriority(IntEnum):
 
     @classmethod
     def try_parse(cls, value):
-        if value in cls._value2member_map_:
-            return PoePriority(value)
-        return None
+        return cls._value2member_map_.get(value)
 
 
 # ---------------------------
@@ -62,9 +99,7 @@ class PoePowerLimit(IntEnum):
 
     @classmethod
     def try_parse(cls, value):
-        if value in cls._value2member_map_:
-            return PoePowerLimit(value)
-        return None
+        return cls._value2member_map_.get(value)
 
 
 # ---------------------------
@@ -79,9 +114,7 @@ class PoeClass(IntEnum):
 
     @classmethod
     def try_parse(cls, value):
-        if value in cls._value2member_map_:
-            return PoeClass(value)
-        return None
+        return cls._value2member_map_.get(value)
 
 
 # ---------------------------
@@ -101,38 +134,382 @@ class PoePowerStatus(IntEnum):
 
     @classmethod
     def try_parse(cls, value):
-        if value in cls._value2member_map_:
-            return PoePowerStatus(value)
+        return cls._value2member_map_.get(value)
+
+
+# ---------------------------
+#   _columns_changes
+# ---------------------------
+def _columns_changes(
+    fields: tuple[str, ...],
+    old_columns: tuple[array, ...],
+    new_columns: tuple[array, ...],
+) -> dict[int, set[str]] | None:
+    if len(old_columns[0]) != len(new_columns[0]):
         return None
 
+    result: dict[int, set[str]] = {}
+    for field_name, old_column, new_column in zip(fields, old_columns, new_columns):
+        if old_column == new_column:
+            continue
+        for index, (old_value, new_value) in enumerate(zip(old_column, new_column)):
+            if old_value != new_value:
+                result.setdefault(index + 1, set()).add(field_name)
+    return result
+
+
+# ---------------------------
+#   PortStates
+# ---------------------------
+class PortStates:
+    """Columnar snapshot of the states of all switch ports."""
+
+    FIELDS: Final = (
+        "enabled",
+        "flow_control_config",
+        "flow_control_actual",
+        "speed_config",
+        "speed_actual",
+    )
+
+    __slots__ = (
+        "_enabled",
+        "_flow_control_config",
+        "_flow_control_actual",
+        "_speed_config",
+        "_speed_actual",
+    )
+
+    def __init__(
+        self,
+        enabled: Iterable[int] = (),
+        flow_control_config: Iterable[int] = (),
+        flow_control_actual: Iterable[int] = (),
+        speed_config: Iterable[int] = (),
+        speed_actual: Iterable[int] = (),
+    ) -> None:
+        """Initialize."""
+        self._enabled = array("B", enabled)
+        self._flow_control_config = array("B", flow_control_config)
+        self._flow_control_actual = array("B", flow_control_actual)
+        self._speed_config = array("B", speed_config)
+        self._speed_actual = array("B", speed_actual)
+
+        count = len(self._enabled)
+        for column in self._columns()[1:]:
+            if len(column) != count:
+                raise ValueError("All port state columns should have the same length")
+
+    def _columns(self) -> tuple[array, ...]:
+        return (
+            self._enabled,
+            self._flow_control_config,
+            self._flow_control_actual,
+            self._speed_config,
+            self._speed_actual,
+        )
+
+    def __len__(self) -> int:
+        """Return the ports count."""
+        return len(self._enabled)
+
+    def __iter__(self) -> Iterator["PortState"]:
+        """Iterate over the port views."""
+        for index in range(len(self._enabled)):
+            yield PortState(self, index)
+
+    def get(self, number: int) -> "PortState | None":
+        """Return the view of the specified port."""
+        if number < 1 or number > len(self._enabled):
+            return None
+        return PortState(self, number - 1)
+
+    def changes(self, other: "PortStates") -> dict[int, set[str]] | None:
+        """Return the changed fields by port number, or None if the ports count differs."""
+        return _columns_changes(self.FIELDS, self._columns(), other._columns())
+
+    def copy_with(
+        self,
+        number: int,
+        enabled: bool | None = None,
+        speed_config: PortSpeed | None = None,
+        flow_control_config: bool | None = None,
+    ) -> "PortStates":
+        """Return a copy of the snapshot with the specified port settings replaced."""
+        if number < 1 or number > len(self._enabled):
+            raise IndexError(f"Port number {number} is out of range")
+        result = PortStates(*self._columns())
+        index = number - 1
+        if enabled is not None:
+            result._enabled[index] = int(enabled)
+        if speed_config is not None:
+            result._speed_config[index] = speed_config
+        if flow_control_config is not None:
+            result._flow_control_config[index] = int(flow_control_config)
+        return result
+
 
 # ---------------------------
 #   PortState
 # ---------------------------
-@dataclass
 class PortState:
+    """Read-only view of a single port in PortStates."""
+
+    __slots__ = ("_states", "_index")
+
+    def __init__(self, states: PortStates, index: int) -> None:
+        """Initialize."""
+        self._states = states
+        self._index = index
+
+    @property
+    def number(self) -> int:
+        return self._index + 1
+
+    @property
+    def enabled(self) -> bool:
+        return self._states._enabled[self._index] == 1
+
+    @property
+    def flow_control_config(self) -> bool:
+        return self._states._flow_control_config[self._index] == 1
+
+    @property
+    def flow_control_actual(self) -> bool:
+        return self._states._flow_control_actual[self._index] == 1
+
+    @property
+    def speed_config(self) -> PortSpeed:
+        return _PORT_SPEEDS.get(
+            self._states._speed_config[self._index], PortSpeed.UNKNOWN
+        )
+
+    @property
+    def speed_actual(self) -> PortSpeed:
+        return _PORT_SPEEDS.get(
+            self._states._speed_actual[self._index], PortSpeed.UNKNOWN
+        )
+
+
+# ---------------------------
+#   PortStateChange
+# ---------------------------
+@dataclass
+class PortStateChange:
     number: int
     enabled: bool
-    flow_control_config: bool
-    flow_control_actual: bool
     speed_config: PortSpeed
-    speed_actual: PortSpeed
+    flow_control_config: bool
+
+
+# ---------------------------
+#   PortPoeStates
+# ---------------------------
+class PortPoeStates:
+    """Columnar snapshot of the PoE states of all switch ports."""
+
+    FIELDS: Final = (
+        "enabled",
+        "priority",
+        "power_limit",
+        "power",
+        "current",
+        "voltage",
+        "pd_class",
+        "power_status",
+    )
+
+    __slots__ = (
+        "_enabled",
+        "_priority",
+        "_power_limit",
+        "_power",
+        "_current",
+        "_voltage",
+        "_pd_class",
+        "_power_status",
+    )
+
+    def __init__(
+        self,
+        enabled: Iterable[int] = (),
+        priority: Iterable[int] = (),
+        power_limit: Iterable[int] = (),
+        power: Iterable[int] = (),
+        current: Iterable[int] = (),
+        voltage: Iterable[int] = (),
+        pd_class: Iterable[int] = (),
+        power_status: Iterable[int] = (),
+    ) -> None:
+        """Initialize with the raw values reported by the switch."""
+        self._enabled = array("B", enabled)
+        self._priority = array("B", priority)
+        self._power_limit = array("i", power_limit)
+        self._power = array("i", power)
+        self._current = array("i", current)
+        self._voltage = array("i", voltage)
+        self._pd_class = array("i", pd_class)
+        self._power_status = array("B", power_status)
+
+        count = len(self._enabled)
+        for column in self._columns()[1:]:
+            if len(column) != count:
+                raise ValueError("All port PoE state columns should have the same length")
+
+    def _columns(self) -> tuple[array, ...]:
+        return (
+            self._enabled,
+            self._priority,
+            self._power_limit,
+            self._power,
+            self._current,
+            self._voltage,
+            self._pd_class,
+            self._power_status,
+        )
+
+    def __len__(self) -> int:
+        """Return the PoE ports count."""
+        return len(self._enabled)
+
+    def __iter__(self) -> Iterator["PortPoeState"]:
+        """Iterate over the port views."""
+        for index in range(len(self._enabled)):
+            yield PortPoeState(self, index)
+
+    def get(self, number: int) -> "PortPoeState | None":
+        """Return the view of the specified port."""
+        if number < 1 or number > len(self._enabled):
+            return None
+        return PortPoeState(self, number - 1)
+
+    def changes(self, other: "PortPoeStates") -> dict[int, set[str]] | None:
+        """Return the changed fields by port number, or None if the ports count differs."""
+        return _columns_changes(self.FIELDS, self._columns(), other._columns())
+
+    def copy_with(
+        self,
+        number: int,
+        enabled: bool | None = None,
+        priority: PoePriority | None = None,
+        power_limit: PoePowerLimit | float | None = None,
+    ) -> "PortPoeStates":
+        """Return a copy of the snapshot with the specified port settings replaced."""
+        if number < 1 or number > len(self._enabled):
+            raise IndexError(f"Port number {number} is out of range")
+        result = PortPoeStates(*self._columns())
+        index = number - 1
+        if enabled is not None:
+            result._enabled[index] = int(enabled)
+        if priority is not None:
+            result._priority[index] = priority
+        if isinstance(power_limit, PoePowerLimit):
+            result._power_limit[index] = power_limit
+        elif power_limit is not None:
+            result._power_limit[index] = round(power_limit * 10)
+        return result
 
 
 # ---------------------------
 #   PortPoeState
 # ---------------------------
-@dataclass
 class PortPoeState:
-    number: int
-    enabled: bool
-    priority: PoePriority
-    power_limit: PoePowerLimit | float
-    power: float
-    current: float
-    voltage: float
-    pd_class: PoeClass | None
-    power_status: PoePowerStatus
+    """Read-only view of a single port in PortPoeStates."""
+
+    __slots__ = ("_states", "_index")
+
+    def __init__(self, states: PortPoeStates, index: int) -> None:
+        """Initialize."""
+        self._states = states
+        self._index = index
+
+    @property
+    def number(self) -> int:
+        return self._index + 1
+
+    @property
+    def enabled(self) -> bool:
+        return self._states._enabled[self._index] == 1
+
+    @property
+    def priority(self) -> PoePriority | None:
+        return PoePriority.try_parse(self._states._priority[self._index])
+
+    @property
+    def power_limit(self) -> PoePowerLimit | float:
+        value = self._states._power_limit[self._index]
+        return PoePowerLimit.try_parse(value) or value / 10
+
+    @property
+    def power(self) -> float:
+        return self._states._power[self._index] / 10
+
+    @property
+    def current(self) -> float:
+        return self._states._current[self._index]
+
+    @property
+    def voltage(self) -> float:
+        return self._states._voltage[self._index] / 10
+
+    @property
+    def pd_class(self) -> PoeClass | None:
+        return PoeClass.try_parse(self._states._pd_class[self._index])
+
+    @property
+    def power_status(self) -> PoePowerStatus | None:
+        return PoePowerStatus.try_parse(self._states._power_status[self._index])
+
+
+# ---------------------------
+#   PortStatistics
+# ---------------------------
+class PortStatistics:
+    """Snapshot of the packet counters of all switch ports.
+
+    The counters are kept in a single array, four per port in the order
+    reported by the switch: TX good, TX bad, RX good and RX bad packets.
+    """
+
+    COUNTERS_PER_PORT: Final = 4
+
+    __slots__ = ("_counters",)
+
+    def __init__(self, counters: Iterable[int] = ()) -> None:
+        """Initialize with the flat list of the counters."""
+        self._counters = array("Q", counters)
+        if len(self._counters) % self.COUNTERS_PER_PORT:
+            raise ValueError("Every port should have four packet counters")
+
+    @property
+    def counters(self) -> array:
+        """Return the flat array of the counters."""
+        return self._counters
+
+    def __len__(self) -> int:
+        """Return the ports count."""
+        return len(self._counters) // self.COUNTERS_PER_PORT
+
+    def get(self, number: int) -> "PortCounters | None":
+        """Return the counters of the specified port."""
+        if number < 1 or number > len(self):
+            return None
+        return PortCounters(
+            *self._counters[
+                (number - 1) * self.COUNTERS_PER_PORT : number * self.COUNTERS_PER_PORT
+            ]
+        )
+
+
+# ---------------------------
+#   PortCounters
+# ---------------------------
+@dataclass
+class PortCounters:
+    tx_good: int
+    tx_bad: int
+    rx_good: int
+    rx_bad: int
 
 
 # ---------------------------
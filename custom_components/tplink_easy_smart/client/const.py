@@ -3,9 +3,13 @@ from typing import Final
 URL_DEVICE_INFO: Final = "SystemInfoRpm.htm"
 URL_PORTS_SETTINGS_GET: Final = "PortSettingRpm.htm"
 URL_POE_SETTINGS_GET: Final = "PoeConfigRpm.htm"
+URL_PORT_STATISTICS_GET: Final = "PortStatisticsRpm.htm"
 
 URL_PORT_SETTINGS_SET: Final = "port_setting.cgi"
 URL_POE_SETTINGS_SET: Final = "poe_global_config.cgi"
 URL_POE_PORT_SETTINGS_SET: Final = "poe_port_config.cgi"
 
 FEATURE_POE: Final = "feature_poe"
+
+# Requests performed in parallel at most
+MAX_CONCURRENCY: Final = 4
@@ -1,17 +1,49 @@
 """TP-Link web api core functions."""
 
 import asyncio
+import codecs
+from contextlib import asynccontextmanager
+from functools import partial
 import logging
 import re
+import time
 from enum import Enum
-from typing import Callable, Dict, Final, Iterable, Tuple, TypeAlias
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Final,
+    Hashable,
+    Iterable,
+    Tuple,
+    TypeAlias,
+    TypeVar,
+)
 
 import aiohttp
-import json5
 from aiohttp import ClientResponse, ServerDisconnectedError
+from yarl import URL
+
+from .const import MAX_CONCURRENCY
+from .metrics import EndpointMetrics, TpLinkMetrics
+from .parser import VariablesStreamExtractor, extract_variables, parse_literal
+from .scheduler import RequestPriority, RequestScheduler
 
 TIMEOUT: Final = 5.0
 
+_RESPONSE_TIME_SMOOTHING: Final = 0.2
+
+# Sessions dropped sooner than that are not considered as expired by idle timeout
+_MIN_IDLE_TIMEOUT: Final = 30.0
+# Part of the learned idle timeout after which the session is kept alive
+_KEEPALIVE_RATIO: Final = 0.8
+# The rest of a page read up to the wanted variables is received and dropped
+# up to that size to keep the connection, a larger rest closes the connection
+_MAX_SKIPPED_BYTES: Final = 64 * 1024
+# Failures of overlapping requests in a row after which parallel mode is given up
+_PARALLEL_FAILURES_LIMIT: Final = 3
+
 APICALL_ERRCODE_UNAUTHORIZED: Final = -2
 APICALL_ERRCODE_REQUEST: Final = -3
 APICALL_ERRCODE_DISCONNECTED: Final = -4
@@ -27,13 +59,17 @@ AUTH_USER_BLOCKED: Final = "auth_user_blocked"
 AUTH_TOO_MANY_USERS: Final = "auth_too_many_users"
 AUTH_SESSION_TIMEOUT: Final = "auth_session_timeout"
 
-_SCRIPT_REGEX = r".*<script>(.*)<\/script>"
-_VARIABLES_REGEX = r".*var\s+(?P<variable>[a-zA-Z0-9_]+)\s*=\s*(?P<value>[^;]+);\s*"
-_ARRAY_VALUES_REGEX = r"\s*new\s*Array\s*\((?P<items>[^\)]+)\)"
+_ARRAY_VALUES_REGEX = re.compile(r"\s*new\s*Array\s*\((?P<items>[^\)]+)\)")
 
 _LOGGER = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 VariableValue: TypeAlias = str | int | list[str] | dict[str, any]
+SessionFactory: TypeAlias = Callable[[aiohttp.CookieJar], aiohttp.ClientSession]
+ResponseReader: TypeAlias = Callable[
+    [ClientResponse, EndpointMetrics], Awaitable[Tuple[str, dict[str, str]]]
+]
 
 _VAR_LOGON_INFO: str = "logonInfo"
 
@@ -114,30 +150,78 @@ async def _get_response_text(response: ClientResponse) -> str:
 
 
 # ---------------------------
-#   _get_variables
+#   _read_response
 # ---------------------------
-def _get_variables(page: str) -> dict[str, str]:
-    result = {}
+async def _read_response(
+    response: ClientResponse, metrics: EndpointMetrics
+) -> Tuple[str, dict[str, str]]:
+    response_text = await _get_response_text(response)
+    started = time.perf_counter()
+    response_variables = extract_variables(response_text)
+    metrics.parse_time.observe(time.perf_counter() - started)
+    return response_text, response_variables
 
-    script_match = re.match(_SCRIPT_REGEX, page, re.RegexFlag.DOTALL)
-    if not script_match:
-        return result
 
-    script_content = script_match.group(0)
+# ---------------------------
+#   _skip_response_rest
+# ---------------------------
+async def _skip_response_rest(response: ClientResponse) -> None:
+    """Drop the rest of the response, keeping the connection if the rest is small.
+
+    A released response that is not read to the end closes its connection, and
+    connecting again costs more than receiving a few kilobytes without parsing.
+    """
+    length = response.content_length
+    if length is not None and length - response.content.total_bytes > _MAX_SKIPPED_BYTES:
+        response.close()
+        return
+
+    skipped = 0
+    while skipped <= _MAX_SKIPPED_BYTES:
+        chunk = await response.content.readany()
+        if not chunk:
+            # the connection has been returned to the pool
+            return
+        skipped += len(chunk)
+    response.close()
 
-    for variable_match in re.finditer(_VARIABLES_REGEX, script_content):
-        variable = variable_match.group("variable")
-        value = variable_match.group("value")
-        result[variable] = value
 
-    return result
+# ---------------------------
+#   _get_variables_reader
+# ---------------------------
+def _get_variables_reader(wanted: set[str]) -> ResponseReader:
+    """Return the reader that stops receiving the page once the wanted variables are found."""
+
+    async def read(
+        response: ClientResponse, metrics: EndpointMetrics
+    ) -> Tuple[str, dict[str, str]]:
+        extractor = VariablesStreamExtractor(wanted, (_VAR_LOGON_INFO,))
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        parse_time = 0.0
+        async for chunk in response.content.iter_any():
+            started = time.perf_counter()
+            is_complete = extractor.feed(decoder.decode(chunk))
+            parse_time += time.perf_counter() - started
+            if is_complete:
+                _LOGGER.debug("Variables found, skipping the rest of the page")
+                await _skip_response_rest(response)
+                break
+        else:
+            started = time.perf_counter()
+            extractor.feed(decoder.decode(b"", final=True))
+            extractor.close()
+            parse_time += time.perf_counter() - started
+        metrics.parse_time.observe(parse_time)
+        return extractor.page, extractor.variables
+
+    return read
 
 
 # ---------------------------
 #   _to_array
 # ---------------------------
 def _to_list(array_data: str) -> Iterable[str]:
-    match = re.match(_ARRAY_VALUES_REGEX, array_data)
+    match = _ARRAY_VALUES_REGEX.match(array_data)
     array_items = match.group("items")
     if array_items:
         for item in array_items.split(","):
@@ -148,7 +232,7 @@ def _to_list(array_data: str) -> Iterable[str]:
 #   _to_dict
 # ---------------------------
 def _to_dict(json_data: str) -> dict[str, any] | None:
-    return json5.loads(json_data) if json_data else None
+    return parse_literal(json_data) if json_data else None
 
 
 # ---------------------------
@@ -173,7 +257,7 @@ def _convert_value(value: str, variable_type: VariableType) -> VariableValue | N
 def _get_variable(
     page: str, name: str, variable_type: VariableType
 ) -> VariableValue | None:
-    variables = _get_variables(page)
+    variables = extract_variables(page)
     if not variables:
         return None
 
@@ -184,15 +268,24 @@ def _get_variable(
     return _convert_value(variable_str, variable_type)
 
 
+# ---------------------------
+#   _create_session
+# ---------------------------
+def _create_session(cookie_jar: aiohttp.CookieJar) -> aiohttp.ClientSession:
+    return aiohttp.ClientSession(cookie_jar=cookie_jar)
+
+
 # ---------------------------
 #   _check_authorized
 # ---------------------------
-def _check_authorized(response: ClientResponse, result: str) -> bool:
+def _check_authorized(
+    response: ClientResponse, result: str, variables: dict[str, str]
+) -> bool:
     if response.status != 200:
         return False
     if not result:
         return False
-    logon_info = _get_variable(result, _VAR_LOGON_INFO, VariableType.Str)
+    logon_info = _convert_value(variables.get(_VAR_LOGON_INFO), VariableType.Str)
     if logon_info:
         return False
     return True
@@ -210,16 +303,29 @@ class TpLinkWebApi:
         user: str,
         password: str,
         verify_ssl: bool,
+        max_concurrency: int = 1,
+        session_factory: SessionFactory | None = None,
     ) -> None:
         """Initialize."""
         _LOGGER.debug("New instance of TpLinkWebApi created")
         self._user: str = user
         self._password: str = password
         self._verify_ssl: bool = verify_ssl
+        self._session_factory: SessionFactory = session_factory or _create_session
         self._session: aiohttp.ClientSession | None = None
         self._active_csrf: Dict | None = None
         self._is_initialized: bool = False
+        self._session_generation: int = 0
         self._call_locker = asyncio.Lock()
+        self._max_concurrency: int = max(1, min(max_concurrency, MAX_CONCURRENCY))
+        self._scheduler = RequestScheduler(self._max_concurrency)
+        self._parallel_failures: int = 0
+        self._response_time: float | None = None
+        self._last_activity: float | None = None
+        self._idle_timeout: float | None = None
+        self._snapshot: dict[str, Tuple[asyncio.Task, set[str]]] | None = None
+        self._snapshot_finished = asyncio.Event()
+        self._metrics = TpLinkMetrics()
 
         schema = "https" if use_ssl else "http"
         self._base_url: str = f"{schema}://{host}:{port}"
@@ -233,31 +339,166 @@ class TpLinkWebApi:
         """Return full address to the endpoint."""
         return self._base_url + "/" + path
 
-    async def _ensure_initialized(self) -> None:
-        """Ensure that initial authorization was completed successfully."""
-        if not self._is_initialized:
-            await self.authenticate()
-            self._is_initialized = True
+    @property
+    def response_time(self) -> float | None:
+        """Return the smoothed time in seconds the device takes to respond to GET."""
+        return self._response_time
+
+    @property
+    def metrics(self) -> TpLinkMetrics:
+        """Return the metrics of the performed requests."""
+        return self._metrics
+
+    def _get_response_metrics(self, response: ClientResponse) -> EndpointMetrics:
+        """Return the metrics of the endpoint the response came from."""
+        return self._metrics.endpoint(response.url.path.lstrip("/"))
+
+    def _track_response_time(self, elapsed: float) -> None:
+        """Update the exponential moving average of the response time."""
+        if self._response_time is None:
+            self._response_time = elapsed
+        else:
+            self._response_time += _RESPONSE_TIME_SMOOTHING * (
+                elapsed - self._response_time
+            )
+
+    @property
+    def idle_timeout(self) -> float | None:
+        """Return the learned time in seconds after which an idle session expires."""
+        return self._idle_timeout
+
+    def _get_idle_time(self) -> float | None:
+        """Return the time since the session was last known to be alive."""
+        if self._last_activity is None:
+            return None
+        return time.monotonic() - self._last_activity
+
+    def _observe_session(self, idle: float | None, is_alive: bool) -> None:
+        """Learn the session idle timeout from the result of a request."""
+        if is_alive:
+            self._last_activity = time.monotonic()
+            if (
+                idle is not None
+                and self._idle_timeout is not None
+                and idle >= self._idle_timeout
+            ):
+                _LOGGER.debug("Session survived %.1fs of inactivity", idle)
+                self._idle_timeout = idle
+        elif idle is not None and idle >= _MIN_IDLE_TIMEOUT:
+            if self._idle_timeout is None or idle < self._idle_timeout:
+                _LOGGER.debug("Session expired after %.1fs of inactivity", idle)
+                self._idle_timeout = idle
+
+    def keepalive_delay(self) -> float | None:
+        """Return the time in seconds until the session should be kept alive."""
+        idle = self._get_idle_time()
+        if idle is None or self._idle_timeout is None:
+            return None
+        return max(0.0, self._idle_timeout * _KEEPALIVE_RATIO - idle)
+
+    async def keepalive(self, path: str, variable: str) -> None:
+        """Keep the session alive, or renew it if it has most likely expired.
+
+        The page is received only up to the variable, like when checking a session.
+        """
+        delay = self.keepalive_delay()
+        if delay is None or delay > 0:
+            return
+
+        if self._get_idle_time() >= self._idle_timeout:
+            _LOGGER.debug("Session is most likely expired, renewing")
+            async with self._call_locker:
+                await self._authenticate_exclusively()
+            return
+
+        _LOGGER.debug("Keeping session alive")
+        generation = self._session_generation
+        if not await self.is_session_alive(path, variable):
+            await self._reauthenticate(generation)
+
+    @property
+    def max_concurrency(self) -> int:
+        """Return the number of requests that may be performed in parallel."""
+        return self._max_concurrency
+
+    async def _ensure_initialized(self) -> int:
+        """Ensure that initial authorization was completed successfully and return the session generation."""
+        started = time.monotonic()
+        async with self._call_locker:
+            self._metrics.lock_wait.observe(time.monotonic() - started)
+            if not self._is_initialized:
+                await self._authenticate_exclusively()
+                self._is_initialized = True
+            return self._session_generation
+
+    async def _reauthenticate(self, generation: int) -> None:
+        """Authenticate again unless another request has already renewed the session."""
+        started = time.monotonic()
+        async with self._call_locker:
+            self._metrics.lock_wait.observe(time.monotonic() - started)
+            if generation == self._session_generation:
+                self._metrics.reauthentications += 1
+                await self._authenticate_exclusively()
+            else:
+                _LOGGER.debug("Session has already been renewed")
+
+    async def _authenticate_exclusively(self) -> None:
+        """Authenticate once the requests in flight are done, the cookies are replaced."""
+        await self._schedule(self.authenticate, RequestPriority.SESSION, exclusive=True)
+
+    async def _schedule(
+        self,
+        request: Callable[[], Awaitable[T]],
+        priority: RequestPriority,
+        key: Hashable = None,
+        exclusive: bool = False,
+    ) -> T:
+        """Perform the request through the scheduler, observing its time in the queue."""
+        queued = time.monotonic()
+
+        async def perform() -> T:
+            self._metrics.queue_wait.observe(time.monotonic() - queued)
+            return await request()
+
+        return await self._scheduler.run(perform, priority, key, exclusive)
+
+    def _fallback_to_serial(self, reason: ApiCallError) -> None:
+        """Stop performing requests in parallel."""
+        _LOGGER.warning(
+            "Parallel requests are not supported by %s, falling back to serial mode: %s",
+            self._base_url,
+            repr(reason),
+        )
+        self._max_concurrency = 1
+        self._scheduler.set_limit(1)
 
     async def _get_raw(self, path: str) -> ClientResponse:
         """Perform GET request to the specified relative URL and return raw ClientResponse."""
+        metrics = self._metrics.endpoint(path)
+        metrics.requests += 1
         try:
             _LOGGER.debug("Performing GET to %s", path)
+            started = time.monotonic()
             response = await self._session.get(
                 url=self._get_url(path),
                 allow_redirects=True,
                 verify_ssl=self._verify_ssl,
                 timeout=TIMEOUT,
             )
+            elapsed = time.monotonic() - started
+            self._track_response_time(elapsed)
+            metrics.latency.observe(elapsed)
             _LOGGER.debug("GET %s performed, status: %s", path, response.status)
             return response
         except ServerDisconnectedError as sde:
+            metrics.errors += 1
             raise ApiCallError(
                 f"Can not perform GET request at {path} cause of {repr(sde)}",
                 APICALL_ERRCODE_DISCONNECTED,
                 APICALL_ERRCAT_DISCONNECTED,
             )
         except Exception as ex:
+            metrics.errors += 1
             _LOGGER.error("GET %s failed: %s", path, str(ex))
             raise ApiCallError(
                 f"Can not perform GET request at {path} cause of {repr(ex)}",
@@ -267,23 +508,29 @@ class TpLinkWebApi:
 
     async def _post_raw(self, path: str, data: Dict) -> ClientResponse:
         """Perform POST request to the specified relative URL with specified body and return raw ClientResponse."""
+        metrics = self._metrics.endpoint(path)
+        metrics.requests += 1
         try:
             _LOGGER.debug("Performing POST to %s", path)
+            started = time.monotonic()
             response = await self._session.post(
                 url=self._get_url(path),
                 data=data,
                 verify_ssl=self._verify_ssl,
                 timeout=TIMEOUT,
             )
+            metrics.latency.observe(time.monotonic() - started)
             _LOGGER.debug("POST to %s performed, status: %s", path, response.status)
             return response
         except ServerDisconnectedError as sde:
+            metrics.errors += 1
             raise ApiCallError(
                 f"Can not perform POST request at {path} cause of {repr(sde)}",
                 APICALL_ERRCODE_DISCONNECTED,
                 APICALL_ERRCAT_DISCONNECTED,
             )
         except Exception as ex:
+            metrics.errors += 1
             _LOGGER.error("POST %s failed: %s", path, str(ex))
             raise ApiCallError(
                 f"Can not perform POST request at {path} cause of {repr(ex)}",
@@ -291,13 +538,59 @@ class TpLinkWebApi:
                 APICALL_ERRCAT_REQUEST,
             )
 
+    @property
+    def session_generation(self) -> int:
+        """Return the number of successful authentications performed by this instance."""
+        return self._session_generation
+
+    def export_session(self) -> dict[str, str] | None:
+        """Return the cookies of the authenticated session."""
+        if self._session is None or not self._is_initialized:
+            return None
+        return {cookie.key: cookie.value for cookie in self._session.cookie_jar}
+
+    async def restore_session(
+        self, cookies: dict[str, str], path: str, variable: str
+    ) -> bool:
+        """Reuse a previously authenticated session instead of logging in.
+
+        The session is checked with a request to the page that is received only
+        up to the variable. Return false if it has expired and a login is needed.
+        """
+        _LOGGER.debug("Restoring session")
+        self._refresh_session()
+        self._session.cookie_jar.update_cookies(cookies, URL(self._base_url))
+        try:
+            self._is_initialized = await self.is_session_alive(path, variable)
+        except ApiCallError as ace:
+            _LOGGER.debug("Can not check the restored session: %s", repr(ace))
+        if not self._is_initialized:
+            _LOGGER.debug("Restored session has expired")
+        return self._is_initialized
+
+    async def is_session_alive(
+        self, path: str, variable: str, priority: RequestPriority = RequestPriority.POLL
+    ) -> bool:
+        """Return true if the session is authorized, receiving the page only up to the variable."""
+        _, _, _, is_authorized = await self._schedule(
+            partial(
+                self._request_once,
+                lambda: self._get_raw(path),
+                _check_authorized,
+                _get_variables_reader({variable}),
+                True,
+            ),
+            priority,
+        )
+        return is_authorized
+
     def _refresh_session(self) -> None:
         """Initialize the client session (if not exists) and clear cookies."""
         _LOGGER.debug("Refresh session called")
         if self._session is None:
             """Unsafe cookies for IP addresses instead of domain names"""
             jar = aiohttp.CookieJar(unsafe=True)
-            self._session = aiohttp.ClientSession(cookie_jar=jar)
+            self._session = self._session_factory(jar)
             _LOGGER.debug("Session created")
         self._session.cookie_jar.clear()
         self._active_csrf = None
@@ -321,6 +614,8 @@ class TpLinkWebApi:
                 raise AuthenticationError("Failed to get index", AUTH_FAILURE_GENERAL)
 
             result = await _get_response_text(response)
+            metrics = self._get_response_metrics(response)
+            metrics.response_bytes += response.content.total_bytes
             if not result:
                 raise AuthenticationError(
                     "Failed to get Logon response body", AUTH_FAILURE_GENERAL
@@ -332,6 +627,9 @@ class TpLinkWebApi:
 
             if array_items[0] == "0":
                 _LOGGER.debug("Authentication success")
+                self._session_generation += 1
+                self._metrics.authentications += 1
+                self._last_activity = time.monotonic()
                 return
             elif array_items[0] == "1":
                 raise AuthenticationError(
@@ -352,6 +650,7 @@ class TpLinkWebApi:
                     AUTH_TOO_MANY_USERS,
                 )
             elif array_items[0] == "5":
+                self._observe_session(self._get_idle_time(), False)
                 raise AuthenticationError(
                     "The session is timeout.",
                     AUTH_SESSION_TIMEOUT,
@@ -375,82 +674,220 @@ class TpLinkWebApi:
                 "Authentication failed due to unknown error", AUTH_FAILURE_GENERAL
             )
 
-    async def get(
-        self, path: str, query: str | None = None, **kwargs: any
-    ) -> str | None:
-        """Perform GET request to the relative address."""
-        async with self._call_locker:
-            await self._ensure_initialized()
-
-            relative_url = path if not query else f"{path}?{query}"
-
-            check_authorized: Callable[[ClientResponse, str], bool] = (
-                kwargs.get("check_authorized") or _check_authorized
+    async def _perform_once(
+        self,
+        method: str,
+        request: Callable[[], Awaitable[ClientResponse]],
+        check_authorized: Callable[[ClientResponse, str, dict[str, str]], bool],
+        read_response: ResponseReader,
+        priority: RequestPriority,
+        key: Hashable,
+    ) -> Tuple[str, dict[str, str]]:
+        """Perform the request, re-authenticating once if the session has expired."""
+        generation = await self._ensure_initialized()
+
+        status, response_text, response_variables, is_authorized = (
+            await self._schedule(
+                partial(
+                    self._request_once, request, check_authorized, read_response, True
+                ),
+                priority,
+                key,
+            )
+        )
+        if is_authorized:
+            return response_text, response_variables
+
+        _LOGGER.debug("%s seems unauthorized, trying to re-authenticate", method)
+        await self._reauthenticate(generation)
+
+        status, response_text, response_variables, is_authorized = (
+            await self._schedule(
+                partial(
+                    self._request_once, request, check_authorized, read_response, False
+                ),
+                priority,
+            )
+        )
+        if not is_authorized:
+            raise ApiCallError(
+                f"Api call error, status:{status}",
+                APICALL_ERRCODE_UNAUTHORIZED,
+                APICALL_ERRCAT_UNAUTHORIZED,
             )
+        return response_text, response_variables
 
-            response = await self._get_raw(relative_url)
-            response_text = await _get_response_text(response)
-            _LOGGER.debug("Response: %s", response_text)
+    async def _request_once(
+        self,
+        request: Callable[[], Awaitable[ClientResponse]],
+        check_authorized: Callable[[ClientResponse, str, dict[str, str]], bool],
+        read_response: ResponseReader,
+        is_first_attempt: bool,
+    ) -> Tuple[int, str, dict[str, str], bool]:
+        """Perform the request and return its status, text, variables and whether the session is alive."""
+        idle = self._get_idle_time() if is_first_attempt else None
+        response = await request()
+        metrics = self._get_response_metrics(response)
+        response_text, response_variables = await read_response(response, metrics)
+        metrics.response_bytes += response.content.total_bytes
+        _LOGGER.debug("Response: %s", response_text)
+
+        is_authorized = check_authorized(response, response_text, response_variables)
+        self._observe_session(idle, is_authorized)
+        return response.status, response_text, response_variables, is_authorized
+
+    async def _perform(
+        self,
+        method: str,
+        request: Callable[[], Awaitable[ClientResponse]],
+        **kwargs: any,
+    ) -> Tuple[str, dict[str, str]]:
+        """Perform the request and fall back to serial mode if the device can not handle parallel ones."""
+        check_authorized: Callable[[ClientResponse, str, dict[str, str]], bool] = (
+            kwargs.get("check_authorized") or _check_authorized
+        )
+        read_response: ResponseReader = kwargs.get("read_response") or _read_response
+        priority: RequestPriority = kwargs.get("priority", RequestPriority.POLL)
+        key: Hashable = kwargs.get("key")
 
-            if not check_authorized(response, response_text):
-                _LOGGER.debug("GET seems unauthorized, trying to re-authenticate")
-                await self.authenticate()
+        try:
+            result = await self._perform_once(
+                method, request, check_authorized, read_response, priority, key
+            )
+        except ApiCallError as ace:
+            if (
+                self._max_concurrency == 1
+                or ace.category
+                not in (APICALL_ERRCAT_DISCONNECTED, APICALL_ERRCAT_UNAUTHORIZED)
+                # a failure with no other request in flight is not caused by them
+                or not self._scheduler.active
+            ):
+                raise
+            self._parallel_failures += 1
+            if self._parallel_failures < _PARALLEL_FAILURES_LIMIT:
+                raise
+            self._fallback_to_serial(ace)
+            return await self._perform_once(
+                method, request, check_authorized, read_response, priority, key
+            )
 
-                response = await self._get_raw(relative_url)
-                response_text = await _get_response_text(response)
+        self._parallel_failures = 0
+        return result
 
-                if not check_authorized(response, response_text):
-                    raise ApiCallError(
-                        f"Api call error, status:{response.status}",
-                        APICALL_ERRCODE_UNAUTHORIZED,
-                        APICALL_ERRCAT_UNAUTHORIZED,
-                    )
+    async def get(
+        self, path: str, query: str | None = None, **kwargs: any
+    ) -> str | None:
+        """Perform GET request to the relative address."""
+        response_text, _ = await self._get(path, query, **kwargs)
+        return response_text
 
-            return response_text
+    async def _get(
+        self, path: str, query: str | None = None, **kwargs: any
+    ) -> Tuple[str, dict[str, str]]:
+        """Perform GET request to the relative address and return the response with its variables."""
+        relative_url = path if not query else f"{path}?{query}"
+        return await self._perform(
+            "GET", lambda: self._get_raw(relative_url), **kwargs
+        )
 
     async def post(
         self, path: str, data: dict | None = None, **kwargs: any
     ) -> str | None:
         """Perform POST request to the relative address."""
-        async with self._call_locker:
-            await self._ensure_initialized()
-
-            check_authorized: Callable[[ClientResponse, str], bool] = (
-                kwargs.get("check_authorized") or _check_authorized
+        response_text, _ = await self._perform(
+            "POST", lambda: self._post_raw(path, data), **kwargs
+        )
+        return response_text
+
+    @asynccontextmanager
+    async def snapshot(self, exclusive: bool = False) -> AsyncIterator[None]:
+        """Share fetched pages between all get_variables calls inside the context.
+
+        An active snapshot is joined, unless exclusive is set: then the active
+        snapshot is waited for, so only the pages fetched from now on are used.
+        """
+        if exclusive:
+            while self._snapshot is not None:
+                _LOGGER.debug("Waiting for the active page snapshot")
+                await self._snapshot_finished.wait()
+        elif self._snapshot is not None:
+            yield
+            return
+
+        _LOGGER.debug("Page snapshot started")
+        self._snapshot = {}
+        self._snapshot_finished.clear()
+        try:
+            yield
+        finally:
+            self._snapshot = None
+            self._snapshot_finished.set()
+            _LOGGER.debug("Page snapshot finished")
+
+    async def _fetch_page_variables(
+        self, path: str, wanted: set[str], **kwargs: any
+    ) -> dict[str, str]:
+        """Perform GET request to the relative address and parse page variables up to the wanted ones."""
+        _, response_variables = await self._get(
+            path,
+            read_response=_get_variables_reader(wanted),
+            key=(path, frozenset(wanted)),
+            **kwargs,
+        )
+        return response_variables
+
+    async def _get_page_variables(
+        self, path: str, wanted: set[str], **kwargs: any
+    ) -> dict[str, str]:
+        """Return page variables, reusing the page fetched within the active snapshot."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return await self._fetch_page_variables(path, wanted, **kwargs)
+
+        entry = snapshot.get(path)
+        if entry is None:
+            entry = (
+                asyncio.create_task(
+                    self._fetch_page_variables(path, wanted, **kwargs)
+                ),
+                wanted,
             )
+            snapshot[path] = entry
+        else:
+            _LOGGER.debug("Using %s from page snapshot", path)
+            # the page may still be being received
+            entry[1].update(wanted)
 
-            response = await self._post_raw(path, data)
-            response_text = await _get_response_text(response)
-            _LOGGER.debug("Response: %s", response_text)
-
-            if not check_authorized(response, response_text):
-                _LOGGER.debug("POST seems unauthorized, trying to re-authenticate")
-                await self.authenticate()
-
-                response = await self._post_raw(path, data)
-                response_text = await _get_response_text(response)
-
-                if not check_authorized(response, response_text):
-                    raise ApiCallError(
-                        f"Api call error, status:{response.status}",
-                        APICALL_ERRCODE_UNAUTHORIZED,
-                        APICALL_ERRCAT_UNAUTHORIZED,
-                    )
+        task = entry[0]
+        try:
+            response_variables = await asyncio.shield(task)
+        except Exception:
+            if snapshot.get(path) is entry:
+                snapshot.pop(path)
+            raise
 
-            return response_text
+        if not wanted.issubset(response_variables):
+            _LOGGER.debug("Variables %s are not in %s snapshot", wanted, path)
+            return await self._fetch_page_variables(path, wanted, **kwargs)
+        return response_variables
 
     async def get_variables(
         self, path: str, variables: Iterable[Tuple[str, VariableType]], **kwargs: any
     ) -> dict[str, VariableValue | None] | None:
         """Perform GET request to the relative address and get dict with the specified variables."""
-        response_text = await self.get(path)
         result = {}
-        response_variables = _get_variables(response_text)
+        variables = list(variables)
+        response_variables = await self._get_page_variables(
+            path, {variable for variable, _ in variables}, **kwargs
+        )
 
+        started = time.perf_counter()
         for variable, variable_type in variables:
             result[variable] = _convert_value(
                 response_variables.get(variable), variable_type
             )
+        # converting the literals is usually the most expensive part of parsing
+        self._metrics.endpoint(path).parse_time.observe(time.perf_counter() - started)
 
         _LOGGER.debug("Result is %s", result)
 
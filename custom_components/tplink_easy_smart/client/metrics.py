@@ -0,0 +1,121 @@
+"""TP-Link web api metrics."""
+
+from bisect import bisect_left
+from typing import Any, Final
+
+# Upper bounds of the latency histogram buckets, seconds
+LATENCY_BUCKETS: Final = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+# Upper bounds of the parse time histogram buckets, seconds
+PARSE_TIME_BUCKETS: Final = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01)
+
+
+# ---------------------------
+#   Histogram
+# ---------------------------
+class Histogram:
+    """Histogram of durations with fixed buckets."""
+
+    __slots__ = ("_bounds", "_counts", "count", "total", "maximum")
+
+    def __init__(self, bounds: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        """Initialize."""
+        self._bounds = bounds
+        self._counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Add a value to the histogram."""
+        self._counts[bisect_left(self._bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.maximum:
+            self.maximum = value
+
+    @property
+    def average(self) -> float | None:
+        """Return the average value."""
+        return self.total / self.count if self.count else None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the histogram as a dict with values in milliseconds."""
+        keys = [f"le_{bound * 1000:g}ms" for bound in self._bounds] + ["inf"]
+        return {
+            "count": self.count,
+            "average_ms": round(self.average * 1000, 3) if self.count else None,
+            "max_ms": round(self.maximum * 1000, 3),
+            "buckets": dict(zip(keys, self._counts)),
+        }
+
+
+# ---------------------------
+#   EndpointMetrics
+# ---------------------------
+class EndpointMetrics:
+    """Metrics of the requests to a single page or setter.
+
+    The parse time is observed once for extracting the variables from every
+    response and once for converting them to values on every read of the page.
+    """
+
+    __slots__ = ("requests", "errors", "response_bytes", "latency", "parse_time")
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.requests = 0
+        self.errors = 0
+        self.response_bytes = 0
+        self.latency = Histogram()
+        self.parse_time = Histogram(PARSE_TIME_BUCKETS)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics as a dict."""
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "response_bytes": self.response_bytes,
+            "latency": self.latency.as_dict(),
+            "parse_time": self.parse_time.as_dict(),
+        }
+
+
+# ---------------------------
+#   TpLinkMetrics
+# ---------------------------
+class TpLinkMetrics:
+    """Metrics of the requests performed by a web api instance."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.endpoints: dict[str, EndpointMetrics] = {}
+        self.authentications = 0
+        self.reauthentications = 0
+        self.lock_wait = Histogram()
+        self.queue_wait = Histogram()
+
+    def endpoint(self, path: str) -> EndpointMetrics:
+        """Return the metrics of the endpoint, ignoring the query."""
+        path = path.partition("?")[0]
+        result = self.endpoints.get(path)
+        if result is None:
+            result = self.endpoints[path] = EndpointMetrics()
+        return result
+
+    @property
+    def requests(self) -> int:
+        """Return the number of requests to all endpoints."""
+        return sum(endpoint.requests for endpoint in self.endpoints.values())
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics as a dict."""
+        return {
+            "authentications": self.authentications,
+            "reauthentications": self.reauthentications,
+            "lock_wait": self.lock_wait.as_dict(),
+            "queue_wait": self.queue_wait.as_dict(),
+            "endpoints": {
+                path: endpoint.as_dict()
+                for path, endpoint in sorted(self.endpoints.items())
+            },
+        }
@@ -0,0 +1,154 @@
+"""TP-Link web page parsing functions."""
+
+import json
+import re
+from typing import Any, Final, Iterable
+
+_SCRIPT_OPEN: Final = "<script"
+_SCRIPT_CLOSE: Final = "</script>"
+
+# Possessive quantifiers make the scan linear: a statement that does not end
+# with ';' fails immediately instead of backtracking through the whole value.
+_VARIABLE_REGEX: Final = re.compile(
+    r"\bvar\s++(?P<variable>\w++)\s*+=\s*+"
+    r"(?P<value>(?:[^;\"']++|\"[^\"]*+\"|'[^']*+')*+);"
+)
+
+# Tokens of the object literals served by the firmware that differ from JSON:
+# unquoted keys, single-quoted strings and trailing commas. Double-quoted
+# strings are matched first so that their content is never rewritten.
+_LITERAL_TOKEN_REGEX: Final = re.compile(
+    r"\"(?:[^\"\\\n]++|\\.)*+\""
+    r"|'(?P<single>[^'\\\n]*+)'"
+    r"|(?P<key>[A-Za-z_$][\w$]*+)(?=\s*+:)"
+    r"|(?P<comma>,)(?=\s*+[\]}])"
+)
+
+
+def _literal_token_to_json(match: re.Match) -> str:
+    if match.group("key") is not None:
+        return f'"{match.group("key")}"'
+    if match.group("comma") is not None:
+        return ""
+    single = match.group("single")
+    if single is not None:
+        return json.dumps(single)
+    return match.group(0)
+
+
+# ---------------------------
+#   extract_variables
+# ---------------------------
+def extract_variables(page: str) -> dict[str, str]:
+    """Return raw values of all variables declared in the page script blocks."""
+    result = {}
+    if not page:
+        return result
+
+    finditer = _VARIABLE_REGEX.finditer
+    position = page.find(_SCRIPT_OPEN)
+    while position >= 0:
+        script_start = page.find(">", position)
+        if script_start < 0:
+            break
+        script_end = page.find(_SCRIPT_CLOSE, script_start)
+        if script_end < 0:
+            script_end = len(page)
+
+        for variable_match in finditer(page, script_start + 1, script_end):
+            result[variable_match.group("variable")] = variable_match.group(
+                "value"
+            ).strip()
+
+        position = page.find(_SCRIPT_OPEN, script_end)
+
+    return result
+
+
+# ---------------------------
+#   parse_literal
+# ---------------------------
+def parse_literal(literal: str) -> Any:
+    """Parse a JS object literal, falling back to json5 for unsupported syntax."""
+    try:
+        return json.loads(_LITERAL_TOKEN_REGEX.sub(_literal_token_to_json, literal))
+    except ValueError:
+        # json5 is slow to import and parse, it is only loaded for the literals
+        # the fast path can not handle
+        import json5
+
+        return json5.loads(literal)
+
+
+# ---------------------------
+#   VariablesStreamExtractor
+# ---------------------------
+class VariablesStreamExtractor:
+    """Extract variables from a page received in parts.
+
+    Script blocks are parsed as soon as they are received completely. The
+    extraction is complete at the end of the block in which the last wanted
+    variable (or any of the final ones) is found, so that the rest of the page
+    does not have to be received. The wanted variables may be added while the
+    page is being received.
+    """
+
+    def __init__(self, wanted: set[str], final: Iterable[str] = ()) -> None:
+        """Initialize."""
+        self._wanted = wanted
+        self._final = frozenset(final)
+        self._parts: list[str] = []
+        self._page = ""
+        self._position = 0
+        self._is_complete = False
+        self.variables: dict[str, str] = {}
+
+    @property
+    def page(self) -> str:
+        """Return the received part of the page."""
+        if self._parts:
+            self._page += "".join(self._parts)
+            self._parts.clear()
+        return self._page
+
+    @property
+    def is_complete(self) -> bool:
+        """Return true if the rest of the page is not needed."""
+        return self._is_complete
+
+    def _is_satisfied(self) -> bool:
+        variables = self.variables
+        if not self._final.isdisjoint(variables):
+            return True
+        return bool(self._wanted) and self._wanted.issubset(variables)
+
+    def feed(self, part: str) -> bool:
+        """Add the next part of the page and return true if the extraction is complete."""
+        if self._is_complete or not part:
+            return self._is_complete
+        self._parts.append(part)
+        # no script block could have been completed by this part
+        if _SCRIPT_CLOSE[-1] not in part:
+            return False
+
+        page = self.page
+        while True:
+            start = page.find(_SCRIPT_OPEN, self._position)
+            if start < 0:
+                break
+            end = page.find(_SCRIPT_CLOSE, start)
+            if end < 0:
+                break
+            end += len(_SCRIPT_CLOSE)
+            self.variables.update(extract_variables(page[start:end]))
+            self._position = end
+            if self._is_satisfied():
+                self._is_complete = True
+                break
+        return self._is_complete
+
+    def close(self) -> None:
+        """Complete the extraction once the whole page is received."""
+        if not self._is_complete:
+            self.variables.update(extract_variables(self.page[self._position :]))
+            self._is_complete = True
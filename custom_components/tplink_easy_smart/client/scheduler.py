@@ -0,0 +1,176 @@
+"""TP-Link web api requests scheduling."""
+
+import asyncio
+from enum import IntEnum
+import heapq
+import itertools
+import logging
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+
+_LOGGER = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+# ---------------------------
+#   RequestPriority
+# ---------------------------
+class RequestPriority(IntEnum):
+    SESSION = 0
+    USER = 1
+    POLL = 2
+
+
+# ---------------------------
+#   _ScheduledRequest
+# ---------------------------
+class _ScheduledRequest:
+    __slots__ = (
+        "request",
+        "key",
+        "priority",
+        "exclusive",
+        "result",
+        "task",
+        "waiters",
+    )
+
+    def __init__(
+        self,
+        request: Callable[[], Awaitable[Any]],
+        key: Hashable,
+        priority: RequestPriority,
+        exclusive: bool,
+        result: asyncio.Future,
+    ) -> None:
+        """Initialize."""
+        self.request = request
+        self.key = key
+        self.priority = priority
+        self.exclusive = exclusive
+        self.result = result
+        self.task: asyncio.Task | None = None
+        self.waiters = 0
+
+
+# ---------------------------
+#   RequestScheduler
+# ---------------------------
+class RequestScheduler:
+    """Limits the number of requests performed at the same time.
+
+    Queued requests are started by priority, in the order of arrival within the
+    same priority. A queued request is superseded by a newer one with the same
+    key: only the newer one is performed and its result is returned to both callers.
+    An exclusive request waits for the running ones and is performed alone.
+    """
+
+    def __init__(self, limit: int) -> None:
+        """Initialize."""
+        self._limit = limit
+        self._active = 0
+        self._is_exclusive = False
+        self._counter = itertools.count()
+        self._queue: list[tuple[int, int, _ScheduledRequest]] = []
+        self._queued_keys: dict[Hashable, _ScheduledRequest] = {}
+
+    @property
+    def active(self) -> int:
+        """Return the number of requests being performed."""
+        return self._active
+
+    def set_limit(self, limit: int) -> None:
+        """Change the number of requests that may be performed at the same time."""
+        self._limit = limit
+        self._dispatch()
+
+    async def run(
+        self,
+        request: Callable[[], Awaitable[T]],
+        priority: RequestPriority = RequestPriority.POLL,
+        key: Hashable = None,
+        exclusive: bool = False,
+    ) -> T:
+        """Perform the request when its turn comes and return its result."""
+        scheduled = self._queued_keys.get(key) if key is not None else None
+        if scheduled is None:
+            scheduled = _ScheduledRequest(
+                request,
+                key,
+                priority,
+                exclusive,
+                asyncio.get_running_loop().create_future(),
+            )
+            if key is not None:
+                self._queued_keys[key] = scheduled
+            self._push(scheduled)
+        else:
+            _LOGGER.debug("Queued request %s superseded", key)
+            scheduled.request = request
+            if priority < scheduled.priority:
+                scheduled.priority = priority
+                self._push(scheduled)
+
+        scheduled.waiters += 1
+        self._dispatch()
+        try:
+            return await asyncio.shield(scheduled.result)
+        except asyncio.CancelledError:
+            scheduled.waiters -= 1
+            if not scheduled.waiters:
+                self._cancel(scheduled)
+            raise
+
+    def _push(self, scheduled: _ScheduledRequest) -> None:
+        heapq.heappush(
+            self._queue, (scheduled.priority, next(self._counter), scheduled)
+        )
+
+    def _cancel(self, scheduled: _ScheduledRequest) -> None:
+        """Drop the request nobody waits for anymore."""
+        if scheduled.task:
+            scheduled.task.cancel()
+            return
+        if self._queued_keys.get(scheduled.key) is scheduled:
+            del self._queued_keys[scheduled.key]
+        scheduled.result.cancel()
+
+    def _dispatch(self) -> None:
+        """Start the queued requests while the limit allows."""
+        while self._queue and not self._is_exclusive:
+            scheduled = self._queue[0][2]
+            if scheduled.task or scheduled.result.done():
+                # cancelled, or queued again with a higher priority
+                heapq.heappop(self._queue)
+                continue
+            if scheduled.exclusive:
+                if self._active:
+                    # the requests queued after it wait until it is performed
+                    break
+                self._is_exclusive = True
+            elif self._active >= self._limit:
+                break
+
+            heapq.heappop(self._queue)
+            if self._queued_keys.get(scheduled.key) is scheduled:
+                del self._queued_keys[scheduled.key]
+            self._active += 1
+            scheduled.task = asyncio.create_task(self._perform(scheduled))
+
+    async def _perform(self, scheduled: _ScheduledRequest) -> None:
+        try:
+            result = await scheduled.request()
+        except asyncio.CancelledError:
+            scheduled.result.cancel()
+            raise
+        except Exception as ex:
+            if not scheduled.result.done():
+                scheduled.result.set_exception(ex)
+        else:
+            if not scheduled.result.done():
+                scheduled.result.set_result(result)
+        finally:
+            self._active -= 1
+            if scheduled.exclusive:
+                self._is_exclusive = False
+            self._dispatch()
@@ -1,7 +1,9 @@
 """TP-Link api."""
 
+import asyncio
 import logging
-from typing import Tuple
+import time
+from typing import AsyncContextManager, Final, Iterable, Tuple
 
 from .classes import (
     PoeClass,
@@ -10,8 +12,13 @@ from .classes import (
     PoePriority,
     PoeState,
     PortPoeState,
+    PortPoeStates,
     PortSpeed,
     PortState,
+    PortStateChange,
+    PortStates,
+    PortStatistics,
+    TpLinkCapabilities,
     TpLinkSystemInfo,
 )
 from .const import (
@@ -21,13 +28,18 @@ from .const import (
     URL_POE_SETTINGS_GET,
     URL_POE_SETTINGS_SET,
     URL_PORT_SETTINGS_SET,
+    URL_PORT_STATISTICS_GET,
     URL_PORTS_SETTINGS_GET,
 )
-from .coreapi import TpLinkWebApi, VariableType
+from .coreapi import SessionFactory, TpLinkWebApi, VariableType
+from .metrics import TpLinkMetrics
+from .scheduler import RequestPriority
 from .utils import TpLinkFeaturesDetector
 
 _LOGGER = logging.getLogger(__name__)
 
+_VAR_DEVICE_INFO: Final = "info_ds"
+
 _POE_PRIORITIES_SET_MAP: dict[PoePriority, int] = {
     PoePriority.HIGH: 1,
     PoePriority.MIDDLE: 2,
@@ -73,25 +85,78 @@ class TpLinkApi:
         user: str,
         password: str,
         verify_ssl: bool,
+        max_concurrency: int = 1,
+        session_factory: SessionFactory | None = None,
+        poe_state_max_age: float = 0,
     ) -> None:
         """Initialize."""
-        self._core_api = TpLinkWebApi(host, port, use_ssl, user, password, verify_ssl)
+        self._core_api = TpLinkWebApi(
+            host,
+            port,
+            use_ssl,
+            user,
+            password,
+            verify_ssl,
+            max_concurrency,
+            session_factory,
+        )
         self._is_features_updated = False
+        self._features_locker = asyncio.Lock()
         self._features = TpLinkFeaturesDetector(self._core_api)
+        self._ports_count: int | None = None
+        self._poe_ports_count: int | None = None
+        self._poe_state: PoeState | None = None
+        self._poe_state_updated_at: float = 0
+        self._poe_state_max_age: float = poe_state_max_age
         _LOGGER.debug("New instance of TpLinkApi created")
 
     async def _ensure_features_updated(self):
-        if not self._is_features_updated:
-            _LOGGER.debug("Updating available features")
-            await self._features.update()
-            self._is_features_updated = True
-            _LOGGER.debug("Available features updated")
+        if self._is_features_updated:
+            return
+        async with self._features_locker:
+            if not self._is_features_updated:
+                _LOGGER.debug("Updating available features")
+                await self._features.update()
+                self._is_features_updated = True
+                _LOGGER.debug("Available features updated")
 
     async def is_feature_available(self, feature: str) -> bool:
         """Return true if specified feature is known and available."""
         await self._ensure_features_updated()
         return self._features.is_available(feature)
 
+    async def detect_capabilities(self) -> TpLinkCapabilities:
+        """Probe the features and count the ports of the switch."""
+        async with self.snapshot():
+            async with self._features_locker:
+                _LOGGER.debug("Detecting capabilities")
+                await self._features.update()
+                self._is_features_updated = True
+                self._ports_count = None
+                self._poe_ports_count = None
+
+            device_info, port_states = await asyncio.gather(
+                self.get_device_info(), self.get_port_states()
+            )
+            poe_ports_count = 0
+            if self._features.is_available(FEATURE_POE):
+                poe_ports_count = await self._get_poe_ports_count() or 0
+
+        return TpLinkCapabilities(
+            mac=device_info.mac,
+            firmware=device_info.firmware,
+            features=self._features.features,
+            ports_count=len(port_states),
+            poe_ports_count=poe_ports_count,
+        )
+
+    def restore_capabilities(self, capabilities: TpLinkCapabilities) -> None:
+        """Use the previously detected capabilities instead of probing the switch."""
+        self._features.restore(capabilities.features)
+        self._is_features_updated = True
+        self._ports_count = capabilities.ports_count or None
+        self._poe_ports_count = capabilities.poe_ports_count or None
+
     async def authenticate(self) -> None:
         """Perform authentication."""
         await self._core_api.authenticate()
@@ -105,10 +170,60 @@ class TpLinkApi:
         """URL address of the device."""
         return self._core_api.device_url
 
+    @property
+    def session_generation(self) -> int:
+        """Number of successful authentications."""
+        return self._core_api.session_generation
+
+    def export_session(self) -> dict[str, str] | None:
+        """Return the authenticated session data."""
+        return self._core_api.export_session()
+
+    async def restore_session(self, cookies: dict[str, str]) -> bool:
+        """Reuse the previously authenticated session, return false if it has expired."""
+        return await self._core_api.restore_session(
+            cookies, URL_DEVICE_INFO, _VAR_DEVICE_INFO
+        )
+
+    def keepalive_delay(self) -> float | None:
+        """Return the time in seconds until the session should be kept alive."""
+        return self._core_api.keepalive_delay()
+
+    async def keepalive(self) -> None:
+        """Keep the session alive, or renew it if it has most likely expired."""
+        await self._core_api.keepalive(URL_DEVICE_INFO, _VAR_DEVICE_INFO)
+
+    @property
+    def response_time(self) -> float | None:
+        """Smoothed time in seconds the device takes to respond."""
+        return self._core_api.response_time
+
+    @property
+    def idle_timeout(self) -> float | None:
+        """Estimated time in seconds after which an idle session expires."""
+        return self._core_api.idle_timeout
+
+    @property
+    def max_concurrency(self) -> int:
+        """Number of requests that may be performed in parallel."""
+        return self._core_api.max_concurrency
+
+    @property
+    def metrics(self) -> TpLinkMetrics:
+        """Metrics of the performed requests."""
+        return self._core_api.metrics
+
+    def snapshot(self, exclusive: bool = False) -> AsyncContextManager[None]:
+        """Fetch every page at most once while the returned context is active.
+
+        With exclusive, the pages fetched by an active snapshot are not reused.
+        """
+        return self._core_api.snapshot(exclusive)
+
     async def get_device_info(self) -> TpLinkSystemInfo:
         """Return the device information."""
         data = await self._core_api.get_variable(
-            URL_DEVICE_INFO, "info_ds", VariableType.Dict
+            URL_DEVICE_INFO, _VAR_DEVICE_INFO, VariableType.Dict
         )
 
         def get_value(key: str) -> str | None:
@@ -129,7 +244,7 @@ class TpLinkApi:
             hardware=get_value("hardwareStr"),
         )
 
-    async def get_port_states(self) -> list[PortState]:
+    async def get_port_states(self) -> PortStates:
         """Return the port states."""
         data = await self._core_api.get_variables(
             URL_PORTS_SETTINGS_GET,
@@ -139,39 +254,49 @@ class TpLinkApi:
             ],
         )
 
-        result: list[PortState] = []
+        all_info = data.get("all_info")
+        if not all_info:
+            return PortStates()
+
+        max_port_num = data.get("max_port_num")
+        if not max_port_num:
+            return PortStates()
+        self._ports_count = max_port_num
+
+        return PortStates(
+            enabled=all_info.get("state")[:max_port_num],
+            flow_control_config=all_info.get("fc_cfg")[:max_port_num],
+            flow_control_actual=all_info.get("fc_act")[:max_port_num],
+            speed_config=all_info.get("spd_cfg")[:max_port_num],
+            speed_actual=all_info.get("spd_act")[:max_port_num],
+        )
+
+    async def get_port_statistics(self) -> PortStatistics:
+        """Return the packet counters of the ports."""
+        data = await self._core_api.get_variables(
+            URL_PORT_STATISTICS_GET,
+            [
+                ("all_info", VariableType.Dict),
+                ("max_port_num", VariableType.Int),
+            ],
+        )
 
         all_info = data.get("all_info")
         if not all_info:
-            return result
+            return PortStatistics()
 
         max_port_num = data.get("max_port_num")
         if not max_port_num:
-            return result
-
-        enabled_flags = all_info.get("state")
-        speeds_config = all_info.get("spd_cfg")
-        speeds_actual = all_info.get("spd_act")
-        fc_config_flags = all_info.get("fc_cfg")
-        fc_actual_flags = all_info.get("fc_act")
-
-        for number in range(1, max_port_num + 1):
-            state = PortState(
-                number=number,
-                speed_config=PortSpeed(speeds_config[number - 1]),
-                speed_actual=PortSpeed(speeds_actual[number - 1]),
-                enabled=enabled_flags[number - 1] == 1,
-                flow_control_config=fc_config_flags[number - 1] == 1,
-                flow_control_actual=fc_actual_flags[number - 1] == 1,
-            )
-            result.append(state)
+            return PortStatistics()
 
-        return result
+        return PortStatistics(
+            all_info.get("pkts")[: max_port_num * PortStatistics.COUNTERS_PER_PORT]
+        )
 
-    async def get_port_poe_states(self) -> list[PortPoeState]:
+    async def get_port_poe_states(self) -> PortPoeStates:
         """Return the port states."""
         if not await self.is_feature_available(FEATURE_POE):
-            return []
+            return PortPoeStates()
 
         data = await self._core_api.get_variables(
             URL_POE_SETTINGS_GET,
@@ -181,43 +306,27 @@ class TpLinkApi:
             ],
         )
 
-        result: list[PortPoeState] = []
-
         port_config = data.get("portConfig")
         if not port_config:
             _LOGGER.debug("No portConfig found, returning")
-            return result
+            return PortPoeStates()
 
         max_port_num = data.get("poe_port_num")
         if not max_port_num:
             _LOGGER.debug("No poe_port_num found, returning")
-            return result
-
-        state_flags = port_config.get("state")
-        priority_flags = port_config.get("priority")
-        powerlimit_flags = port_config.get("powerlimit")
-        powers = port_config.get("power")
-        currents = port_config.get("current")
-        voltages = port_config.get("voltage")
-        pdclass_flags = port_config.get("pdclass")
-        powerstatus_flags = port_config.get("powerstatus")
-
-        for number in range(1, max_port_num + 1):
-            state = PortPoeState(
-                number=number,
-                enabled=state_flags[number - 1] == 1,
-                priority=PoePriority(priority_flags[number - 1]),
-                current=currents[number - 1],
-                voltage=voltages[number - 1] / 10,
-                power_limit=PoePowerLimit.try_parse(powerlimit_flags[number - 1])
-                or powerlimit_flags[number - 1] / 10,
-                power_status=PoePowerStatus(powerstatus_flags[number - 1]),
-                pd_class=PoeClass.try_parse(pdclass_flags[number - 1]),
-                power=powers[number - 1] / 10,
-            )
-            result.append(state)
-
-        return result
+            return PortPoeStates()
+        self._poe_ports_count = max_port_num
+
+        return PortPoeStates(
+            enabled=port_config.get("state")[:max_port_num],
+            priority=port_config.get("priority")[:max_port_num],
+            power_limit=port_config.get("powerlimit")[:max_port_num],
+            power=port_config.get("power")[:max_port_num],
+            current=port_config.get("current")[:max_port_num],
+            voltage=port_config.get("voltage")[:max_port_num],
+            pd_class=port_config.get("pdclass")[:max_port_num],
+            power_status=port_config.get("powerstatus")[:max_port_num],
+        )
 
     async def get_poe_state(self) -> PoeState | None:
         """Return the port states."""
@@ -233,13 +342,23 @@ class TpLinkApi:
             _LOGGER.debug("No globalConfig found, returning")
             return None
 
-        return PoeState(
+        self._poe_state = PoeState(
             power_limit=poe_config.get("system_power_limit", 0) / 10,
             power_remain=poe_config.get("system_power_remain", 0) / 10,
             power_limit_min=poe_config.get("system_power_limit_min", 0) / 10,
             power_limit_max=poe_config.get("system_power_limit_max", 0) / 10,
             power_consumption=poe_config.get("system_power_consumption", 0) / 10,
         )
+        self._poe_state_updated_at = time.monotonic()
+        return self._poe_state
+
+    async def _get_recent_poe_state(self) -> PoeState | None:
+        """Return the PoE state fetched within the max age, fetching it if outdated."""
+        age = time.monotonic() - self._poe_state_updated_at
+        if self._poe_state is not None and age <= self._poe_state_max_age:
+            _LOGGER.debug("Using PoE state fetched %.1fs ago", age)
+            return self._poe_state
+        return await self.get_poe_state()
 
     async def set_port_state(
         self,
@@ -249,21 +368,64 @@ class TpLinkApi:
         flow_control_config: bool,
     ) -> None:
         """Change port state."""
+        await self.set_port_states(
+            [PortStateChange(number, enabled, speed_config, flow_control_config)]
+        )
+
+    async def set_port_states(self, changes: Iterable[PortStateChange]) -> None:
+        """Change states of several ports, one request per distinct settings."""
+        numbers_by_settings: dict[Tuple[bool, PortSpeed, bool], list[int]] = {}
+        changes = {change.number: change for change in changes}.values()
+        if not changes:
+            raise ActionError("No port numbers specified")
+
+        ports_count = await self._get_ports_count()
+        if not ports_count:
+            raise ActionError("Can not get ports count")
+
+        for change in changes:
+            if change.number < 1:
+                raise ActionError("Port number should be greater than or equals to 1")
+            if change.number > ports_count:
+                raise ActionError(
+                    f"Port number should be less than or equals to {ports_count}"
+                )
+            numbers_by_settings.setdefault(
+                (change.enabled, change.speed_config, change.flow_control_config), []
+            ).append(change.number)
+
+        await asyncio.gather(
+            *(
+                self._set_ports_state(numbers, *settings)
+                for settings, numbers in numbers_by_settings.items()
+            )
+        )
+
+    async def _set_ports_state(
+        self,
+        numbers: list[int],
+        enabled: bool,
+        speed_config: PortSpeed,
+        flow_control_config: bool,
+    ) -> None:
+        """Apply the same state to the specified ports with a single request."""
         query: str = (
-            f"portid={number}&"
-            f"state={1 if enabled else 0}&"
+            "".join(f"portid={number}&" for number in numbers)
+            + f"state={1 if enabled else 0}&"
             f"speed={speed_config.value}&"
             f"flowcontrol={1 if flow_control_config else 0}&"
             f"apply=Apply"
         )
-        await self._core_api.get(URL_PORT_SETTINGS_SET, query=query)
+        await self._core_api.get(
+            URL_PORT_SETTINGS_SET, query=query, priority=RequestPriority.USER
+        )
 
     async def set_poe_limit(self, limit: float) -> None:
         """Change poe limit."""
         if not await self.is_feature_available(FEATURE_POE):
             raise ActionError("POE feature is not supported by device")
 
-        current_state = await self.get_poe_state()
+        current_state = await self._get_recent_poe_state()
         if not current_state:
             raise ActionError("Can not get actual PoE state")
 
@@ -282,7 +444,10 @@ class TpLinkApi:
             "name_powerremain": current_state.power_remain,
             "applay": "Apply",
         }
-        result = await self._core_api.post(URL_POE_SETTINGS_SET, data)
+        self._poe_state = None
+        result = await self._core_api.post(
+            URL_POE_SETTINGS_SET, data, priority=RequestPriority.USER
+        )
         _LOGGER.debug("POE_SET_RESULT: %s", result)
 
     async def set_port_poe_settings(
@@ -292,19 +457,49 @@ class TpLinkApi:
         priority: PoePriority,
         power_limit: PoePowerLimit | float,
     ) -> None:
+        """Change port poe settings."""
+        await self.set_ports_poe_settings(
+            [port_number], enabled, priority, power_limit
+        )
+
+    async def _get_ports_count(self) -> int | None:
+        """Return the number of ports, fetching it only once."""
+        if not self._ports_count:
+            self._ports_count = await self._core_api.get_variable(
+                URL_PORTS_SETTINGS_GET, "max_port_num", VariableType.Int
+            )
+        return self._ports_count
+
+    async def _get_poe_ports_count(self) -> int | None:
+        """Return the number of PoE ports, fetching it only once."""
+        if not self._poe_ports_count:
+            self._poe_ports_count = await self._core_api.get_variable(
+                URL_POE_SETTINGS_GET, "poe_port_num", VariableType.Int
+            )
+        return self._poe_ports_count
+
+    async def set_ports_poe_settings(
+        self,
+        port_numbers: Iterable[int],
+        enabled: bool,
+        priority: PoePriority,
+        power_limit: PoePowerLimit | float,
+    ) -> None:
+        """Apply the same PoE settings to the specified ports with a single request."""
         if not await self.is_feature_available(FEATURE_POE):
             raise ActionError("POE feature is not supported by device")
-        """Change port poe settings."""
-        if port_number < 1:
+
+        port_numbers = sorted(set(port_numbers))
+        if not port_numbers:
+            raise ActionError("No port numbers specified")
+        if port_numbers[0] < 1:
             raise ActionError("Port number should be greater than or equals to 1")
 
-        poe_ports_count = await self._core_api.get_variable(
-            URL_POE_SETTINGS_GET, "poe_port_num", VariableType.Int
-        )
+        poe_ports_count = await self._get_poe_ports_count()
         if not poe_ports_count:
             raise ActionError("Can not get PoE ports count")
 
-        if port_number > poe_ports_count:
+        if port_numbers[-1] > poe_ports_count:
             raise ActionError(
                 f"Port number should be less than or equals to {poe_ports_count}"
             )
@@ -333,8 +528,10 @@ class TpLinkApi:
             "name_ppriority": ppriority,
             "name_ppowerlimit": ppowerlimit,
             "name_ppowerlimit2": ppowerlimit2,
-            f"sel_{port_number}": 1,
+            **{f"sel_{port_number}": 1 for port_number in port_numbers},
             "applay": "Apply",
         }
-        result = await self._core_api.post(URL_POE_PORT_SETTINGS_SET, data)
+        result = await self._core_api.post(
+            URL_POE_PORT_SETTINGS_SET, data, priority=RequestPriority.USER
+        )
         _LOGGER.debug("POE_PORT_SETTINGS_SET_RESULT: %s", result)
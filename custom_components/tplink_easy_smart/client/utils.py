@@ -1,5 +1,6 @@
 import logging
 from functools import wraps
+from typing import Iterable
 
 from .const import FEATURE_POE, URL_POE_SETTINGS_GET
 from .coreapi import (
@@ -72,8 +73,19 @@ class TpLinkFeaturesDetector:
 
     async def update(self) -> None:
         """Update the available features list."""
+        available_features = set()
         if await self._is_poe_available():
-            self._available_features.add(FEATURE_POE)
+            available_features.add(FEATURE_POE)
+        self._available_features = available_features
+
+    def restore(self, features: Iterable[str]) -> None:
+        """Use the previously detected features instead of updating them."""
+        self._available_features = set(features)
+
+    @property
+    def features(self) -> frozenset[str]:
+        """Return the available features."""
+        return frozenset(self._available_features)
 
     def is_available(self, feature: str) -> bool:
         """Return true if feature is available."""
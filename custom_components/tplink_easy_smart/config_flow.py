@@ -17,22 +17,42 @@ from homeassistant.const import (
 )
 from homeassistant.core import callback
 
-from .client.coreapi import AuthenticationError, TpLinkWebApi
+from .client.const import MAX_CONCURRENCY
+from .client.coreapi import AuthenticationError
+from .client.tplink_api import TpLinkApi
 from .const import (
+    CONF_CAPABILITIES,
+    DEFAULT_ADAPTIVE_SCAN_INTERVAL,
     DEFAULT_HOST,
     DEFAULT_NAME,
     DEFAULT_PASS,
+    DEFAULT_PERSIST_SESSION,
+    DEFAULT_POE_STATE_MAX_AGE,
     DEFAULT_POE_STATE_SWITCHES,
     DEFAULT_PORT,
     DEFAULT_PORT_STATE_SWITCHES,
+    DEFAULT_PORT_STATISTICS,
+    DEFAULT_REQUEST_CONCURRENCY,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_SCAN_INTERVAL_MAX,
+    DEFAULT_SCAN_INTERVAL_MIN,
     DEFAULT_SSL,
+    DEFAULT_SYSTEM_INFO_SCAN_INTERVAL,
     DEFAULT_USER,
     DEFAULT_VERIFY_SSL,
     DOMAIN,
+    OPT_ADAPTIVE_SCAN_INTERVAL,
+    OPT_PERSIST_SESSION,
+    OPT_POE_STATE_MAX_AGE,
     OPT_POE_STATE_SWITCHES,
     OPT_PORT_STATE_SWITCHES,
+    OPT_PORT_STATISTICS,
+    OPT_REQUEST_CONCURRENCY,
+    OPT_SCAN_INTERVAL_MAX,
+    OPT_SCAN_INTERVAL_MIN,
+    OPT_SYSTEM_INFO_SCAN_INTERVAL,
 )
+from .update_coordinator import get_session_factory
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -78,14 +98,18 @@ class TpLinkControllerConfigFlow(ConfigFlow, domain=DOMAIN):
             if user_input[CONF_NAME] in configured_instances(self.hass):
                 errors["base"] = "name_exists"
 
-            # Test connection
-            api = TpLinkWebApi(
+            # Test connection and detect what the switch supports
+            capabilities = None
+            api = TpLinkApi(
                 host=user_input[CONF_HOST],
                 port=user_input[CONF_PORT],
                 use_ssl=user_input[CONF_SSL],
                 user=user_input[CONF_USERNAME],
                 password=user_input[CONF_PASSWORD],
                 verify_ssl=user_input[CONF_VERIFY_SSL],
+                session_factory=get_session_factory(
+                    self.hass, user_input[CONF_VERIFY_SSL]
+                ),
             )
             try:
                 await api.authenticate()
@@ -94,14 +118,21 @@ class TpLinkControllerConfigFlow(ConfigFlow, domain=DOMAIN):
             except Exception as ex:
                 _LOGGER.warning("Setup failed: %s", {str(ex)})
                 errors["base"] = "auth_general"
+            else:
+                # the capabilities are detected on the first update otherwise
+                try:
+                    capabilities = await api.detect_capabilities()
+                except Exception as ex:
+                    _LOGGER.warning("Can not detect capabilities: %s", repr(ex))
             finally:
                 await api.disconnect()
 
             # Save instance
             if not errors:
-                return self.async_create_entry(
-                    title=user_input[CONF_NAME], data=user_input
-                )
+                data = dict(user_input)
+                if capabilities:
+                    data[CONF_CAPABILITIES] = capabilities.as_dict()
+                return self.async_create_entry(title=user_input[CONF_NAME], data=data)
 
             return self._show_config_form(user_input=user_input, errors=errors)
 
@@ -176,6 +207,49 @@ class TpLinkControllerOptionsFlowHandler(OptionsFlow):
                             ),
                         ),
                     ): int,
+                    vol.Required(
+                        OPT_ADAPTIVE_SCAN_INTERVAL,
+                        default=self._local_config_entry.options.get(
+                            OPT_ADAPTIVE_SCAN_INTERVAL, DEFAULT_ADAPTIVE_SCAN_INTERVAL
+                        ),
+                    ): bool,
+                    vol.Required(
+                        OPT_SCAN_INTERVAL_MIN,
+                        default=self._local_config_entry.options.get(
+                            OPT_SCAN_INTERVAL_MIN, DEFAULT_SCAN_INTERVAL_MIN
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                    vol.Required(
+                        OPT_SCAN_INTERVAL_MAX,
+                        default=self._local_config_entry.options.get(
+                            OPT_SCAN_INTERVAL_MAX, DEFAULT_SCAN_INTERVAL_MAX
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                    vol.Required(
+                        OPT_SYSTEM_INFO_SCAN_INTERVAL,
+                        default=self._local_config_entry.options.get(
+                            OPT_SYSTEM_INFO_SCAN_INTERVAL,
+                            DEFAULT_SYSTEM_INFO_SCAN_INTERVAL,
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                    vol.Required(
+                        OPT_REQUEST_CONCURRENCY,
+                        default=self._local_config_entry.options.get(
+                            OPT_REQUEST_CONCURRENCY, DEFAULT_REQUEST_CONCURRENCY
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=MAX_CONCURRENCY)),
+                    vol.Required(
+                        OPT_PERSIST_SESSION,
+                        default=self._local_config_entry.options.get(
+                            OPT_PERSIST_SESSION, DEFAULT_PERSIST_SESSION
+                        ),
+                    ): bool,
+                    vol.Required(
+                        OPT_POE_STATE_MAX_AGE,
+                        default=self._local_config_entry.options.get(
+                            OPT_POE_STATE_MAX_AGE, DEFAULT_POE_STATE_MAX_AGE
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0)),
                 }
             ),
         )
@@ -202,6 +276,12 @@ class TpLinkControllerOptionsFlowHandler(OptionsFlow):
                             OPT_POE_STATE_SWITCHES, DEFAULT_POE_STATE_SWITCHES
                         ),
                     ): bool,
+                    vol.Required(
+                        OPT_PORT_STATISTICS,
+                        default=self._local_config_entry.options.get(
+                            OPT_PORT_STATISTICS, DEFAULT_PORT_STATISTICS
+                        ),
+                    ): bool,
                 },
             ),
         )
@@ -7,7 +7,13 @@ from homeassistant.const import Platform
 DOMAIN: Final = "tplink_easy_smart"
 
 DATA_KEY_COORDINATOR: Final = "coordinator"
+DATA_KEY_FIRST_REFRESH: Final = "first_refresh"
 DATA_KEY_SERVICES: Final = "services_count"
+DATA_KEY_FLEET: Final = "fleet"
+DATA_KEY_SETTINGS: Final = "settings"
+
+# Entry data key of the capabilities detected by the config flow
+CONF_CAPABILITIES: Final = "capabilities"
 
 DEFAULT_HOST: Final = "192.168.0.1"
 DEFAULT_USER: Final = "admin"
@@ -17,11 +23,34 @@ DEFAULT_PASS: Final = ""
 DEFAULT_NAME: Final = "TP-Link Switch"
 DEFAULT_VERIFY_SSL: Final = False
 DEFAULT_SCAN_INTERVAL: Final = 30
+DEFAULT_SYSTEM_INFO_SCAN_INTERVAL: Final = 3600
+DEFAULT_ADAPTIVE_SCAN_INTERVAL: Final = False
+DEFAULT_SCAN_INTERVAL_MIN: Final = 10
+DEFAULT_SCAN_INTERVAL_MAX: Final = 120
+DEFAULT_PERSIST_SESSION: Final = False
+DEFAULT_POE_STATE_MAX_AGE: Final = 60
+DEFAULT_PORT_STATISTICS: Final = False
 DEFAULT_PORT_STATE_SWITCHES: Final = False
 DEFAULT_POE_STATE_SWITCHES: Final = False
+DEFAULT_REQUEST_CONCURRENCY: Final = 1
 
 OPT_PORT_STATE_SWITCHES: Final = "port_state_switches"
 OPT_POE_STATE_SWITCHES: Final = "poe_state_switches"
+OPT_REQUEST_CONCURRENCY: Final = "request_concurrency"
+OPT_SYSTEM_INFO_SCAN_INTERVAL: Final = "system_info_scan_interval"
+OPT_ADAPTIVE_SCAN_INTERVAL: Final = "adaptive_scan_interval"
+OPT_SCAN_INTERVAL_MIN: Final = "scan_interval_min"
+OPT_SCAN_INTERVAL_MAX: Final = "scan_interval_max"
+OPT_PERSIST_SESSION: Final = "persist_session"
+OPT_POE_STATE_MAX_AGE: Final = "poe_state_max_age"
+OPT_PORT_STATISTICS: Final = "port_statistics"
+
+SESSION_STORAGE_VERSION: Final = 1
+SESSION_STORAGE_KEY_FORMAT: Final = DOMAIN + ".session.{}"
+SESSION_SAVE_DELAY: Final = 10
+
+# Setup waits that many seconds for the first update, then it goes on in the background
+FIRST_REFRESH_DEADLINE: Final = 20
 
 ATTR_MANUFACTURER: Final = "TP-Link"
 PLATFORMS: Final = [
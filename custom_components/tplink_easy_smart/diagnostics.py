@@ -0,0 +1,37 @@
+"""Diagnostics support for TP-Link."""
+
+from dataclasses import asdict
+from typing import Any, Final
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from .helpers import get_coordinator
+
+TO_REDACT: Final = {CONF_PASSWORD, CONF_USERNAME, "mac"}
+
+
+# ---------------------------
+#   async_get_config_entry_diagnostics
+# ---------------------------
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, config_entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator = get_coordinator(hass, config_entry)
+    switch_info = coordinator.get_switch_info()
+
+    return {
+        "entry": {
+            "data": async_redact_data(dict(config_entry.data), TO_REDACT),
+            "options": dict(config_entry.options),
+        },
+        "switch_info": (
+            async_redact_data(asdict(switch_info), TO_REDACT) if switch_info else None
+        ),
+        "ports_count": coordinator.ports_count,
+        "ports_poe_count": coordinator.ports_poe_count,
+        "connection": coordinator.get_diagnostics(),
+    }
@@ -0,0 +1,103 @@
+"""Polling schedules for TP-Link."""
+
+import asyncio
+from datetime import timedelta
+import math
+from typing import Final
+
+_BACKOFF_FACTOR: Final = 1.5
+# The switch should not spend more than 1/20 of the time serving our requests.
+_RESPONSE_TIME_FACTOR: Final = 20
+# Updates of all switches performed at the same time
+FLEET_MAX_REFRESHES: Final = 4
+
+
+# ---------------------------
+#   TpLinkAdaptiveInterval
+# ---------------------------
+class TpLinkAdaptiveInterval:
+    """Poll interval that follows the port activity and the switch response time."""
+
+    def __init__(self, minimum: float, maximum: float, initial: float) -> None:
+        """Initialize."""
+        self._minimum = minimum
+        self._maximum = max(minimum, maximum)
+        self._interval = self._clamp(initial)
+
+    def _clamp(self, interval: float) -> float:
+        return min(max(interval, self._minimum), self._maximum)
+
+    @property
+    def interval(self) -> timedelta:
+        """Return the current poll interval."""
+        return timedelta(seconds=self._interval)
+
+    def update(self, is_active: bool, response_time: float | None) -> timedelta:
+        """Return the next poll interval after a refresh."""
+        if is_active:
+            interval = self._minimum
+        else:
+            interval = self._interval * _BACKOFF_FACTOR
+
+        if response_time is not None:
+            interval = max(interval, response_time * _RESPONSE_TIME_FACTOR)
+
+        self._interval = self._clamp(interval)
+        return self.interval
+
+
+# ---------------------------
+#   TpLinkFleetSchedule
+# ---------------------------
+class TpLinkFleetSchedule:
+    """Spreads the updates of all switches evenly over their intervals.
+
+    Every switch gets its own phase, a fraction of the interval its updates are
+    aligned to. The phases are reassigned when a switch is added or removed,
+    and the number of updates performed at the same time is limited.
+    """
+
+    def __init__(self, max_refreshes: int = FLEET_MAX_REFRESHES) -> None:
+        """Initialize."""
+        self._members: list[str] = []
+        self._phases: dict[str, float] = {}
+        self._refreshes = asyncio.Semaphore(max_refreshes)
+
+    def add(self, member: str) -> None:
+        """Add the switch to the schedule."""
+        if member not in self._members:
+            self._members.append(member)
+            self._rebalance()
+
+    def remove(self, member: str) -> None:
+        """Remove the switch from the schedule."""
+        if member in self._members:
+            self._members.remove(member)
+            self._rebalance()
+
+    def _rebalance(self) -> None:
+        count = len(self._members)
+        self._phases = {
+            member: index / count for index, member in enumerate(self._members)
+        }
+
+    def refresh_slot(self) -> asyncio.Semaphore:
+        """Return the context to perform an update in."""
+        return self._refreshes
+
+    def align(self, member: str, interval: timedelta, now: float) -> timedelta:
+        """Return the delay that brings the next update of the switch to its phase.
+
+        The delay is between a half and one and a half of the interval, so the
+        switches are polled as often as their intervals require on average.
+        """
+        phase = self._phases.get(member)
+        seconds = interval.total_seconds()
+        if phase is None or seconds <= 0:
+            return interval
+
+        offset = phase * seconds
+        target = (math.floor((now - offset) / seconds) + 1) * seconds + offset
+        if target - now < seconds / 2:
+            target += seconds
+        return timedelta(seconds=target - now)
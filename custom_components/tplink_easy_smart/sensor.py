@@ -2,7 +2,7 @@
 
 from dataclasses import dataclass, field
 import logging
-from typing import Final
+from typing import Callable, Final
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
@@ -12,11 +12,14 @@ from homeassistant.components.sensor import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
-    UnitOfPower
+    EntityCategory,
+    UnitOfPower,
+    UnitOfTime,
 )
 
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.typing import StateType
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from .client.const import FEATURE_POE
 
@@ -26,7 +29,11 @@ from .helpers import (
     generate_entity_unique_id,
     get_coordinator,
 )
-from .update_coordinator import TpLinkDataUpdateCoordinator
+from .update_coordinator import (
+    LISTENER_KIND_PORT_RATES,
+    TpLinkDataUpdateCoordinator,
+    TpLinkPortListenerContext,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -36,6 +43,23 @@ _FUNCTION_UID_NETWORK_INFO: Final = "network_info"
 _FUNCTION_DISPLAYED_NAME_POE_INFO: Final = "PoE consumption"
 _FUNCTION_UID_POE_INFO: Final = "poe_consumption"
 
+_FUNCTION_DISPLAYED_NAME_PORT_TX_RATE_FORMAT: Final = "Port {} TX rate"
+_FUNCTION_UID_PORT_TX_RATE_FORMAT: Final = "port_{}_tx_rate"
+
+_FUNCTION_DISPLAYED_NAME_PORT_RX_RATE_FORMAT: Final = "Port {} RX rate"
+_FUNCTION_UID_PORT_RX_RATE_FORMAT: Final = "port_{}_rx_rate"
+
+_UNIT_PACKETS_PER_SECOND: Final = "packets/s"
+
+_FUNCTION_DISPLAYED_NAME_RESPONSE_TIME: Final = "Response time"
+_FUNCTION_UID_RESPONSE_TIME: Final = "response_time"
+
+_FUNCTION_DISPLAYED_NAME_REQUESTS: Final = "Requests"
+_FUNCTION_UID_REQUESTS: Final = "requests"
+
+_FUNCTION_DISPLAYED_NAME_REAUTHENTICATIONS: Final = "Re-authentications"
+_FUNCTION_UID_REAUTHENTICATIONS: Final = "reauthentications"
+
 ENTITY_DOMAIN: Final = "sensor"
 
 
@@ -55,6 +79,37 @@ class TpLinkSensorEntityDescription(SensorEntityDescription):
         self.name = generate_entity_name(self.function_name, self.device_name)
 
 
+# ---------------------------
+#   TpLinkPortRateSensorEntityDescription
+# ---------------------------
+@dataclass
+class TpLinkPortRateSensorEntityDescription(TpLinkSensorEntityDescription):
+    """A class that describes port packet rate sensor entities."""
+
+    port_number: int | None = None
+    direction: str | None = None
+
+
+# ---------------------------
+#   TpLinkMetricSensorEntityDescription
+# ---------------------------
+@dataclass
+class TpLinkMetricSensorEntityDescription(TpLinkSensorEntityDescription):
+    """A class that describes the sensors of the requests metrics."""
+
+    value_fn: Callable[[TpLinkDataUpdateCoordinator], StateType] | None = None
+    entity_category: EntityCategory | None = EntityCategory.DIAGNOSTIC
+    entity_registry_enabled_default: bool = False
+
+
+# ---------------------------
+#   _get_response_time
+# ---------------------------
+def _get_response_time(coordinator: TpLinkDataUpdateCoordinator) -> StateType:
+    response_time = coordinator.get_response_time()
+    return round(response_time * 1000, 1) if response_time is not None else None
+
+
 # ---------------------------
 #   async_setup_entry
 # ---------------------------
@@ -96,6 +151,78 @@ async def async_setup_entry(
             )
         )
 
+    device_name = coordinator.get_switch_info().name
+
+    if coordinator.port_rates_enabled:
+        for port_number in range(1, coordinator.ports_count + 1):
+            for direction, name_format, uid_format, icon in (
+                (
+                    "tx",
+                    _FUNCTION_DISPLAYED_NAME_PORT_TX_RATE_FORMAT,
+                    _FUNCTION_UID_PORT_TX_RATE_FORMAT,
+                    "mdi:upload-network-outline",
+                ),
+                (
+                    "rx",
+                    _FUNCTION_DISPLAYED_NAME_PORT_RX_RATE_FORMAT,
+                    _FUNCTION_UID_PORT_RX_RATE_FORMAT,
+                    "mdi:download-network-outline",
+                ),
+            ):
+                sensors.append(
+                    TpLinkPortRateSensor(
+                        coordinator,
+                        TpLinkPortRateSensorEntityDescription(
+                            key=f"port_{port_number}_{direction}_rate",
+                            icon=icon,
+                            native_unit_of_measurement=_UNIT_PACKETS_PER_SECOND,
+                            state_class=SensorStateClass.MEASUREMENT,
+                            port_number=port_number,
+                            direction=direction,
+                            device_name=device_name,
+                            function_uid=uid_format.format(port_number),
+                            function_name=name_format.format(port_number),
+                        ),
+                    )
+                )
+
+    sensors.extend(
+        TpLinkMetricSensor(coordinator, description)
+        for description in (
+            TpLinkMetricSensorEntityDescription(
+                key="response_time",
+                icon="mdi:timer-outline",
+                device_class=SensorDeviceClass.DURATION,
+                native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+                state_class=SensorStateClass.MEASUREMENT,
+                device_name=device_name,
+                function_uid=_FUNCTION_UID_RESPONSE_TIME,
+                function_name=_FUNCTION_DISPLAYED_NAME_RESPONSE_TIME,
+                value_fn=_get_response_time,
+            ),
+            TpLinkMetricSensorEntityDescription(
+                key="requests",
+                icon="mdi:swap-horizontal",
+                state_class=SensorStateClass.TOTAL_INCREASING,
+                device_name=device_name,
+                function_uid=_FUNCTION_UID_REQUESTS,
+                function_name=_FUNCTION_DISPLAYED_NAME_REQUESTS,
+                value_fn=lambda coordinator: coordinator.get_metrics().requests,
+            ),
+            TpLinkMetricSensorEntityDescription(
+                key="reauthentications",
+                icon="mdi:account-key",
+                state_class=SensorStateClass.TOTAL_INCREASING,
+                device_name=device_name,
+                function_uid=_FUNCTION_UID_REAUTHENTICATIONS,
+                function_name=_FUNCTION_DISPLAYED_NAME_REAUTHENTICATIONS,
+                value_fn=lambda coordinator: (
+                    coordinator.get_metrics().reauthentications
+                ),
+            ),
+        )
+    )
+
     async_add_entities(sensors)
 
 
@@ -109,9 +236,10 @@ class TpLinkSensor(CoordinatorEntity[TpLinkDataUpdateCoordinator], SensorEntity)
         self,
         coordinator: TpLinkDataUpdateCoordinator,
         description: TpLinkSensorEntityDescription,
+        context: TpLinkPortListenerContext | None = None,
     ) -> None:
         """Initialize."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context)
         self.entity_description = description
         self._attr_device_info = coordinator.get_device_info()
         self._attr_unique_id = generate_entity_unique_id(
@@ -163,6 +291,11 @@ class TpLinkNetworkInfoSensor(TpLinkSensor):
             self._attr_available = False
         super()._handle_coordinator_update()
 
+    async def async_update(self) -> None:
+        """Update the entity on demand, including the rarely polled switch info."""
+        self.coordinator.request_switch_info_update()
+        await super().async_update()
+
 
 # ---------------------------
 #   TpLinkPoeInfoSensor
@@ -192,3 +325,57 @@ class TpLinkPoeInfoSensor(TpLinkSensor):
         else:
             self._attr_available = False
         super()._handle_coordinator_update()
+
+
+# ---------------------------
+#   TpLinkPortRateSensor
+# ---------------------------
+class TpLinkPortRateSensor(TpLinkSensor):
+    entity_description: TpLinkPortRateSensorEntityDescription
+    _attr_native_value: float | None = None
+
+    def __init__(
+        self,
+        coordinator: TpLinkDataUpdateCoordinator,
+        description: TpLinkPortRateSensorEntityDescription,
+    ) -> None:
+        """Initialize."""
+        direction = description.direction
+        super().__init__(
+            coordinator,
+            description,
+            TpLinkPortListenerContext(
+                LISTENER_KIND_PORT_RATES,
+                description.port_number,
+                frozenset({direction, f"{direction}_errors"}),
+            ),
+        )
+        self._attr_native_value = None
+        self._attr_extra_state_attributes = {}
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        rates = self.coordinator.get_port_rates(self.entity_description.port_number)
+        if rates:
+            direction = self.entity_description.direction
+            self._attr_native_value = getattr(rates, direction)
+            self._attr_extra_state_attributes["errors"] = getattr(
+                rates, f"{direction}_errors"
+            )
+            self._attr_available = True
+        else:
+            self._attr_available = False
+        super()._handle_coordinator_update()
+
+
+# ---------------------------
+#   TpLinkMetricSensor
+# ---------------------------
+class TpLinkMetricSensor(TpLinkSensor):
+    entity_description: TpLinkMetricSensorEntityDescription
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        self._attr_native_value = self.entity_description.value_fn(self.coordinator)
+        self._attr_available = self.coordinator.last_update_success
+        super()._handle_coordinator_update()
@@ -13,8 +13,8 @@ from homeassistant.exceptions import HomeAssistantError, ServiceNotFound
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.service import verify_domain_control
 
-from .client.classes import PoePowerLimit, PoePriority
-from .const import DATA_KEY_COORDINATOR, DATA_KEY_SERVICES, DOMAIN
+from .client.classes import PoePowerLimit, PoePriority, PortSpeed, PortStateChange
+from .const import DATA_KEY_COORDINATOR, DATA_KEY_FLEET, DATA_KEY_SERVICES, DOMAIN
 from .update_coordinator import TpLinkDataUpdateCoordinator
 
 _LOGGER = logging.getLogger(__name__)
@@ -25,8 +25,22 @@ _FIELD_PORT_NUMBER: Final = "port_number"
 _FIELD_ENABLED: Final = "enabled"
 _FIELD_PRIORITY: Final = "priority"
 _FIELD_MANUAL_POWER_LIMIT: Final = "manual_power_limit"
+_FIELD_SPEED: Final = "speed"
+_FIELD_FLOW_CONTROL: Final = "flow_control"
 
 _CV_MAC_ADDR: Final = cv.matches_regex("^([A-Fa-f0-9]{2}\\:){5}[A-Fa-f0-9]{2}$")
+_CV_PORT_NUMBERS: Final = vol.All(
+    cv.ensure_list_csv, [vol.All(vol.Coerce(int), vol.Range(min=1))]
+)
+
+_PORT_SPEED_MAP: dict[str, PortSpeed] = {
+    "Auto": PortSpeed.AUTO,
+    "10MH": PortSpeed.HALF_10M,
+    "10MF": PortSpeed.FULL_10M,
+    "100MH": PortSpeed.HALF_100M,
+    "100MF": PortSpeed.FULL_100M,
+    "1000MF": PortSpeed.FULL_1000M,
+}
 
 _POE_PRIORITY_MAP: dict[str, PoePriority] = {
     "High": PoePriority.HIGH,
@@ -50,6 +64,7 @@ _POE_POWER_LIMIT_MAP: dict[str, PoePowerLimit | None] = {
 class ServiceNames(StrEnum):
     SET_GENERAL_POE_LIMIT = "set_general_poe_limit"
     SET_PORT_POE_SETTINGS = "set_port_poe_settings"
+    SET_PORT_STATE = "set_port_state"
 
 
 @dataclass
@@ -76,9 +91,7 @@ SERVICES = [
         schema=vol.Schema(
             {
                 vol.Required(_FIELD_MAC_ADDRESS): _CV_MAC_ADDR,
-                vol.Required(_FIELD_PORT_NUMBER): vol.All(
-                    vol.Coerce(int), vol.Range(min=1)
-                ),
+                vol.Required(_FIELD_PORT_NUMBER): _CV_PORT_NUMBERS,
                 vol.Required(_FIELD_ENABLED): vol.Coerce(bool),
                 vol.Required(_FIELD_PRIORITY): vol.In(list(_POE_PRIORITY_MAP.keys())),
                 vol.Required(_FIELD_POWER_LIMIT): vol.In(
@@ -90,6 +103,18 @@ SERVICES = [
             }
         ),
     ),
+    ServiceDescription(
+        name=ServiceNames.SET_PORT_STATE,
+        schema=vol.Schema(
+            {
+                vol.Required(_FIELD_MAC_ADDRESS): _CV_MAC_ADDR,
+                vol.Required(_FIELD_PORT_NUMBER): _CV_PORT_NUMBERS,
+                vol.Required(_FIELD_ENABLED): vol.Coerce(bool),
+                vol.Optional(_FIELD_SPEED): vol.In(list(_PORT_SPEED_MAP.keys())),
+                vol.Optional(_FIELD_FLOW_CONTROL): vol.Coerce(bool),
+            }
+        ),
+    ),
 ]
 
 
@@ -101,7 +126,7 @@ def _find_coordinator(
 ) -> TpLinkDataUpdateCoordinator | None:
     _LOGGER.debug("Looking for coordinator with address '%s'", device_mac)
     for key, item in hass.data[DOMAIN].items():
-        if key == DATA_KEY_SERVICES:
+        if key in (DATA_KEY_SERVICES, DATA_KEY_FLEET):
             continue
         coordinator = item.get(DATA_KEY_COORDINATOR)
         if not coordinator or not isinstance(coordinator, TpLinkDataUpdateCoordinator):
@@ -139,7 +164,7 @@ async def _async_set_general_poe_limit(hass: HomeAssistant, service: ServiceCall
 #   _async_set_port_poe_settings
 # ---------------------------
 async def _async_set_port_poe_settings(hass: HomeAssistant, service: ServiceCall):
-    """Service to set port poe settings."""
+    """Service to set poe settings of one or more ports."""
     device_mac = service.data[_FIELD_MAC_ADDRESS].upper()
 
     coordinator = _find_coordinator(hass, device_mac)
@@ -156,16 +181,76 @@ async def _async_set_port_poe_settings(hass: HomeAssistant, service: ServiceCall
     )
 
     try:
-        port_number: int = service.data[_FIELD_PORT_NUMBER]
+        port_numbers: list[int] = service.data[_FIELD_PORT_NUMBER]
         enabled: bool = service.data[_FIELD_ENABLED]
         priority: PoePriority = _POE_PRIORITY_MAP[service.data[_FIELD_PRIORITY]]
         power_limit: PoePowerLimit | float = _POE_POWER_LIMIT_MAP[
             service.data[_FIELD_POWER_LIMIT]
         ] or float(service.data[_FIELD_MANUAL_POWER_LIMIT])
 
-        await coordinator.async_set_port_poe_settings(
-            port_number, enabled, priority, power_limit
+        await coordinator.async_set_ports_poe_settings(
+            port_numbers, enabled, priority, power_limit
+        )
+    except Exception as ex:
+        raise HomeAssistantError(str(ex))
+
+
+# ---------------------------
+#   _async_set_port_state
+# ---------------------------
+async def _async_set_port_state(hass: HomeAssistant, service: ServiceCall):
+    """Service to set the state of one or more ports."""
+    device_mac = service.data[_FIELD_MAC_ADDRESS].upper()
+
+    coordinator = _find_coordinator(hass, device_mac)
+    if not coordinator:
+        raise HomeAssistantError(
+            f"Can not find coordinator with mac address '{device_mac}'"
         )
+
+    _LOGGER.debug(
+        "Service '%s' called for mac '%s' with name %s",
+        service.service,
+        device_mac,
+        coordinator.name,
+    )
+
+    try:
+        enabled: bool = service.data[_FIELD_ENABLED]
+        speed: str | None = service.data.get(_FIELD_SPEED)
+        flow_control: bool | None = service.data.get(_FIELD_FLOW_CONTROL)
+
+        changes: list[PortStateChange] = []
+        ports_count = coordinator.ports_count
+        for port_number in service.data[_FIELD_PORT_NUMBER]:
+            if not 1 <= port_number <= ports_count:
+                raise HomeAssistantError(
+                    f"Port #{port_number} does not exist, the switch has "
+                    f"{ports_count} ports"
+                )
+            port_state = coordinator.get_port_state(port_number)
+            if not port_state and (speed is None or flow_control is None):
+                raise HomeAssistantError(
+                    f"Can not get the current state of port #{port_number}"
+                )
+            changes.append(
+                PortStateChange(
+                    number=port_number,
+                    enabled=enabled,
+                    speed_config=(
+                        _PORT_SPEED_MAP[speed]
+                        if speed is not None
+                        else port_state.speed_config
+                    ),
+                    flow_control_config=(
+                        flow_control
+                        if flow_control is not None
+                        else port_state.flow_control_config
+                    ),
+                )
+            )
+
+        await coordinator.async_set_port_states(changes)
     except Exception as ex:
         raise HomeAssistantError(str(ex))
 
@@ -197,9 +282,12 @@ async def async_setup_services(hass: HomeAssistant, config_entry: ConfigEntry) -
         if service_name == ServiceNames.SET_GENERAL_POE_LIMIT:
             await _async_set_general_poe_limit(hass, service)
 
-        if service_name == ServiceNames.SET_PORT_POE_SETTINGS:
+        elif service_name == ServiceNames.SET_PORT_POE_SETTINGS:
             await _async_set_port_poe_settings(hass, service)
 
+        elif service_name == ServiceNames.SET_PORT_STATE:
+            await _async_set_port_state(hass, service)
+
         else:
             raise ServiceNotFound(DOMAIN, service_name)
 
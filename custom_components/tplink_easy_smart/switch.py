@@ -25,7 +25,12 @@ from .helpers import (
     generate_entity_unique_id,
     get_coordinator,
 )
-from .update_coordinator import TpLinkDataUpdateCoordinator
+from .update_coordinator import (
+    LISTENER_KIND_PORT_POE_STATE,
+    LISTENER_KIND_PORT_STATE,
+    TpLinkDataUpdateCoordinator,
+    TpLinkPortListenerContext,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -133,9 +138,10 @@ class TpLinkSwitch(CoordinatorEntity[TpLinkDataUpdateCoordinator], SwitchEntity,
         self,
         coordinator: TpLinkDataUpdateCoordinator,
         description: TpLinkSwitchEntityDescription,
+        context: TpLinkPortListenerContext | None = None,
     ) -> None:
         """Initialize."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context)
 
         self.entity_description = description
         self._attr_device_info = coordinator.get_device_info()
@@ -205,13 +211,21 @@ class TpLinkPortStateSwitch(TpLinkSwitch):
         description: TpLinkPortSwitchEntityDescription,
     ) -> None:
         """Initialize."""
-        super().__init__(coordinator, description)
+        super().__init__(
+            coordinator,
+            description,
+            TpLinkPortListenerContext(
+                LISTENER_KIND_PORT_STATE,
+                description.port_number,
+                frozenset({"enabled"}),
+            ),
+        )
         self._attr_is_on = None
         self._attr_extra_state_attributes = {}
         self._port_number = description.port_number
 
     async def _go_to_state(self, state: bool):
-        info = self._port_info
+        info = self.coordinator.get_port_state(self._port_number)
         if not info:
             _LOGGER.warning(
                 "Can not change switch '%s' state: port info not found", self.name
@@ -223,8 +237,8 @@ class TpLinkPortStateSwitch(TpLinkSwitch):
 
     @callback
     def _handle_coordinator_update(self) -> None:
-        self._port_info = self.coordinator.get_port_state(self._port_number)
-        self._attr_is_on = self._port_info.enabled if self._port_info else None
+        port_info = self.coordinator.get_port_state(self._port_number)
+        self._attr_is_on = port_info.enabled if port_info else None
         super()._handle_coordinator_update()
 
 
@@ -240,13 +254,21 @@ class TpLinkPortPoeStateSwitch(TpLinkSwitch):
         description: TpLinkPortSwitchEntityDescription,
     ) -> None:
         """Initialize."""
-        super().__init__(coordinator, description)
+        super().__init__(
+            coordinator,
+            description,
+            TpLinkPortListenerContext(
+                LISTENER_KIND_PORT_POE_STATE,
+                description.port_number,
+                frozenset({"enabled"}),
+            ),
+        )
         self._attr_is_on = None
         self._attr_extra_state_attributes = {}
         self._port_number = description.port_number
 
     async def _go_to_state(self, state: bool):
-        info = self._port_poe_info
+        info = self.coordinator.get_port_poe_state(self._port_number)
         if not info:
             _LOGGER.warning(
                 "Can not change switch '%s' PoE state: port info not found", self.name
@@ -258,6 +280,6 @@ class TpLinkPortPoeStateSwitch(TpLinkSwitch):
 
     @callback
     def _handle_coordinator_update(self) -> None:
-        self._port_poe_info = self.coordinator.get_port_poe_state(self._port_number)
-        self._attr_is_on = self._port_poe_info.enabled if self._port_poe_info else None
+        port_poe_info = self.coordinator.get_port_poe_state(self._port_number)
+        self._attr_is_on = port_poe_info.enabled if port_poe_info else None
         super()._handle_coordinator_update()
@@ -0,0 +1,134 @@
+"""Port traffic rates for TP-Link."""
+
+from array import array
+from dataclasses import dataclass
+from typing import Final
+
+from .client.classes import PortStatistics
+
+# The switch packet counters are 32 bits wide
+_COUNTER_MODULO: Final = 1 << 32
+# A counter that decreased from above this value has wrapped around, otherwise it was reset
+_WRAP_THRESHOLD: Final = _COUNTER_MODULO // 2
+
+_RATE_FIELDS: Final = ("tx", "tx_errors", "rx", "rx_errors")
+
+
+# ---------------------------
+#   PortRates
+# ---------------------------
+@dataclass(frozen=True)
+class PortRates:
+    """Packets per second sent and received by a port."""
+
+    tx: float
+    tx_errors: float
+    rx: float
+    rx_errors: float
+
+
+# ---------------------------
+#   _counter_delta
+# ---------------------------
+def _counter_delta(old: int, new: int) -> int:
+    if new >= old:
+        return new - old
+    if old >= _WRAP_THRESHOLD:
+        return new + _COUNTER_MODULO - old
+    # the counters were cleared or the switch restarted during the interval
+    return new
+
+
+# ---------------------------
+#   TpLinkPortRates
+# ---------------------------
+class TpLinkPortRates:
+    """Packet rates of the switch ports averaged over the last counter samples.
+
+    The counter deltas of the last `window` intervals are kept in a ring buffer
+    allocated once for the ports count, and their sums are updated
+    incrementally, so an update costs the same regardless of the window.
+    """
+
+    def __init__(self, window: int) -> None:
+        """Initialize."""
+        self._window = max(1, window)
+        self._ports_count = 0
+        self._counters: array | None = None
+        self._timestamp: float | None = None
+        self._deltas = array("q")
+        self._sums = array("q")
+        self._durations = array("d")
+        self._duration_sum = 0.0
+        self._position = 0
+        self._rates: list[PortRates | None] = []
+
+    def _reset(self, ports_count: int) -> None:
+        """Allocate the buffers for the ports count and forget the history."""
+        size = ports_count * PortStatistics.COUNTERS_PER_PORT
+        self._ports_count = ports_count
+        self._counters = None
+        self._timestamp = None
+        self._deltas = array("q", bytes(self._deltas.itemsize * size * self._window))
+        self._sums = array("q", bytes(self._sums.itemsize * size))
+        self._durations = array("d", bytes(self._durations.itemsize * self._window))
+        self._duration_sum = 0.0
+        self._position = 0
+        self._rates = [None] * ports_count
+
+    def get(self, number: int) -> PortRates | None:
+        """Return the rates of the specified port, if known yet."""
+        if number < 1 or number > self._ports_count:
+            return None
+        return self._rates[number - 1]
+
+    def update(
+        self, statistics: PortStatistics, timestamp: float
+    ) -> dict[int, set[str]] | None:
+        """Add the counters sample taken at the monotonic timestamp.
+
+        Return the changed rates by port number, or None if the ports count differs.
+        """
+        changes: dict[int, set[str]] | None = {}
+        if len(statistics) != self._ports_count:
+            self._reset(len(statistics))
+            changes = None
+
+        previous, self._counters = self._counters, statistics.counters
+        previous_timestamp, self._timestamp = self._timestamp, timestamp
+        if previous is None or timestamp <= previous_timestamp:
+            return changes
+
+        slot = self._position
+        self._position = (slot + 1) % self._window
+        duration = timestamp - previous_timestamp
+        self._duration_sum += duration - self._durations[slot]
+        self._durations[slot] = duration
+
+        counters, deltas, sums = self._counters, self._deltas, self._sums
+        offset = slot * len(sums)
+        for index, (old, new) in enumerate(zip(previous, counters)):
+            delta = _counter_delta(old, new)
+            sums[index] += delta - deltas[offset + index]
+            deltas[offset + index] = delta
+
+        per_port = PortStatistics.COUNTERS_PER_PORT
+        for number in range(1, self._ports_count + 1):
+            start = (number - 1) * per_port
+            rates = PortRates(
+                *(
+                    round(total / self._duration_sum, 2)
+                    for total in sums[start : start + per_port]
+                )
+            )
+            old_rates = self._rates[number - 1]
+            self._rates[number - 1] = rates
+            if changes is None or rates == old_rates:
+                continue
+            changes[number] = {
+                field
+                for field in _RATE_FIELDS
+                if old_rates is None
+                or getattr(rates, field) != getattr(old_rates, field)
+            }
+        return changes
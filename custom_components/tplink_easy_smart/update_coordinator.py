@@ -1,8 +1,14 @@
 """Update coordinator for TP-Link."""
-from datetime import timedelta
+import asyncio
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
+from functools import partial
 import logging
+import time
+from typing import Any, Awaitable, Callable, Final
 
-from homeassistant.config_entries import ConfigEntry
+from aiohttp import ClientSession, CookieJar
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
 from homeassistant.const import (
     CONF_HOST,
     CONF_NAME,
@@ -13,17 +19,146 @@ from homeassistant.const import (
     CONF_USERNAME,
     CONF_VERIFY_SSL,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.entity import DeviceInfo
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
-
-from .client.classes import PoePowerLimit, PoePriority, TpLinkSystemInfo
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from .client.classes import (
+    PoePowerLimit,
+    PoePriority,
+    PortPoeStates,
+    PortStateChange,
+    PortStates,
+    TpLinkCapabilities,
+    TpLinkSystemInfo,
+)
 from .client.const import FEATURE_POE
+from .client.coreapi import SessionFactory
+from .client.metrics import TpLinkMetrics
 from .client.tplink_api import PoeState, PortPoeState, PortSpeed, PortState, TpLinkApi
-from .const import ATTR_MANUFACTURER, DEFAULT_SCAN_INTERVAL, DOMAIN
+from .const import (
+    DATA_KEY_FLEET,
+    ATTR_MANUFACTURER,
+    CONF_CAPABILITIES,
+    DEFAULT_ADAPTIVE_SCAN_INTERVAL,
+    DEFAULT_PERSIST_SESSION,
+    DEFAULT_POE_STATE_MAX_AGE,
+    DEFAULT_PORT_STATISTICS,
+    DEFAULT_REQUEST_CONCURRENCY,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_SCAN_INTERVAL_MAX,
+    DEFAULT_SCAN_INTERVAL_MIN,
+    DEFAULT_SYSTEM_INFO_SCAN_INTERVAL,
+    DOMAIN,
+    OPT_ADAPTIVE_SCAN_INTERVAL,
+    OPT_PERSIST_SESSION,
+    OPT_POE_STATE_MAX_AGE,
+    OPT_PORT_STATISTICS,
+    OPT_REQUEST_CONCURRENCY,
+    OPT_SCAN_INTERVAL_MAX,
+    OPT_SCAN_INTERVAL_MIN,
+    OPT_SYSTEM_INFO_SCAN_INTERVAL,
+    SESSION_SAVE_DELAY,
+    SESSION_STORAGE_KEY_FORMAT,
+    SESSION_STORAGE_VERSION,
+)
+from .scheduling import TpLinkAdaptiveInterval, TpLinkFleetSchedule
+from .traffic import PortRates, TpLinkPortRates
+from .write_queue import TpLinkWriteQueue
 
 _LOGGER = logging.getLogger(__name__)
 
+LISTENER_KIND_PORT_STATE: Final = "port_state"
+LISTENER_KIND_PORT_POE_STATE: Final = "port_poe_state"
+LISTENER_KIND_PORT_RATES: Final = "port_rates"
+
+# Port rates are averaged over that many updates
+_PORT_RATES_WINDOW: Final = 4
+
+_WRITE_KIND_POE_STATE: Final = "poe_state"
+# Written data is read back once no more writes are made for that many seconds
+_WRITE_CONFIRMATION_DELAY: Final = 3
+# Writes made within that many seconds are merged and applied together
+_WRITE_QUEUE_DELAY: Final = 0.2
+
+# Changes of these fields make the adaptive interval poll faster
+_ACTIVITY_FIELDS: Final = {
+    LISTENER_KIND_PORT_STATE: frozenset({"enabled", "speed_actual"}),
+    LISTENER_KIND_PORT_POE_STATE: frozenset({"enabled", "power_status"}),
+}
+
+
+# ---------------------------
+#   TpLinkPortListenerContext
+# ---------------------------
+@dataclass(frozen=True)
+class TpLinkPortListenerContext:
+    """Listener context of an entity that only depends on a single port."""
+
+    kind: str
+    number: int
+    fields: frozenset[str] | None = None
+
+
+# ---------------------------
+#   get_session_store
+# ---------------------------
+def get_session_store(hass: HomeAssistant, entry_id: str) -> Store:
+    """Return the storage of the authenticated session of the config entry."""
+    return Store(
+        hass, SESSION_STORAGE_VERSION, SESSION_STORAGE_KEY_FORMAT.format(entry_id)
+    )
+
+
+# ---------------------------
+#   _load_capabilities
+# ---------------------------
+def _load_capabilities(config_entry: ConfigEntry) -> TpLinkCapabilities | None:
+    """Return the capabilities stored with the config entry, if any."""
+    data = config_entry.data.get(CONF_CAPABILITIES)
+    if not data:
+        return None
+    try:
+        return TpLinkCapabilities.from_dict(data)
+    except (KeyError, TypeError) as ex:
+        _LOGGER.debug("Ignoring stored capabilities: %s", repr(ex))
+        return None
+
+
+# ---------------------------
+#   get_fleet_schedule
+# ---------------------------
+def get_fleet_schedule(hass: HomeAssistant) -> TpLinkFleetSchedule:
+    """Return the update schedule shared by all switches."""
+    data = hass.data.setdefault(DOMAIN, {})
+    schedule = data.get(DATA_KEY_FLEET)
+    if schedule is None:
+        schedule = data[DATA_KEY_FLEET] = TpLinkFleetSchedule()
+    return schedule
+
+
+# ---------------------------
+#   get_session_factory
+# ---------------------------
+def get_session_factory(hass: HomeAssistant, verify_ssl: bool) -> SessionFactory:
+    """Return the factory of client sessions sharing the Home Assistant connector.
+
+    Connections and SSL contexts are pooled by the shared connector while every
+    switch keeps its own cookie jar.
+    """
+
+    def create_session(cookie_jar: CookieJar) -> ClientSession:
+        return async_create_clientsession(
+            hass, verify_ssl, auto_cleanup=False, cookie_jar=cookie_jar
+        )
+
+    return create_session
+
 
 # ---------------------------
 #   TpLinkDataUpdateCoordinator
@@ -40,23 +175,86 @@ class TpLinkDataUpdateCoordinator(DataUpdateCoordinator):
             user=config_entry.data[CONF_USERNAME],
             password=config_entry.data[CONF_PASSWORD],
             verify_ssl=config_entry.data[CONF_VERIFY_SSL],
+            max_concurrency=config_entry.options.get(
+                OPT_REQUEST_CONCURRENCY, DEFAULT_REQUEST_CONCURRENCY
+            ),
+            session_factory=get_session_factory(
+                hass, config_entry.data[CONF_VERIFY_SSL]
+            ),
+            poe_state_max_age=config_entry.options.get(
+                OPT_POE_STATE_MAX_AGE, DEFAULT_POE_STATE_MAX_AGE
+            ),
+        )
+        self._capabilities: TpLinkCapabilities | None = _load_capabilities(
+            config_entry
         )
+        if self._capabilities:
+            self._api.restore_capabilities(self._capabilities)
         self._switch_info: TpLinkSystemInfo | None = None
-        self._port_states: list[PortState] = []
-        self._port_poe_states: list[PortPoeState] = []
+        self._switch_info_updated_at: datetime | None = None
+        self._is_switch_info_update_requested: bool = False
+        self._switch_info_interval = timedelta(
+            seconds=config_entry.options.get(
+                OPT_SYSTEM_INFO_SCAN_INTERVAL, DEFAULT_SYSTEM_INFO_SCAN_INTERVAL
+            )
+        )
+        self._port_states: PortStates = PortStates()
+        self._port_poe_states: PortPoeStates = PortPoeStates()
         self._poe_state: PoeState | None = None
+        self._port_rates: TpLinkPortRates | None = None
+        if config_entry.options.get(OPT_PORT_STATISTICS, DEFAULT_PORT_STATISTICS):
+            self._port_rates = TpLinkPortRates(_PORT_RATES_WINDOW)
+        self._changes: dict[tuple[str, int], set[str]] | None = None
+
+        self._session_store: Store | None = None
+        self._saved_session_generation: int = 0
+        self._keepalive_unsub: CALLBACK_TYPE | None = None
+        self._unconfirmed_writes: dict[tuple[str, int], set[str]] = {}
+        if config_entry.options.get(OPT_PERSIST_SESSION, DEFAULT_PERSIST_SESSION):
+            self._session_store = get_session_store(hass, config_entry.entry_id)
 
         update_interval = config_entry.options.get(
             CONF_SCAN_INTERVAL,
             config_entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
         )
 
+        self._base_update_interval = timedelta(seconds=update_interval)
+        self._adaptive_interval: TpLinkAdaptiveInterval | None = None
+        if config_entry.options.get(
+            OPT_ADAPTIVE_SCAN_INTERVAL, DEFAULT_ADAPTIVE_SCAN_INTERVAL
+        ):
+            self._adaptive_interval = TpLinkAdaptiveInterval(
+                minimum=config_entry.options.get(
+                    OPT_SCAN_INTERVAL_MIN, DEFAULT_SCAN_INTERVAL_MIN
+                ),
+                maximum=config_entry.options.get(
+                    OPT_SCAN_INTERVAL_MAX, DEFAULT_SCAN_INTERVAL_MAX
+                ),
+                initial=update_interval,
+            )
+
         super().__init__(
             hass,
             _LOGGER,
             name=config_entry.data[CONF_NAME],
             update_method=self.async_update,
-            update_interval=timedelta(seconds=update_interval),
+            update_interval=(
+                self._adaptive_interval.interval
+                if self._adaptive_interval
+                else self._base_update_interval
+            ),
+        )
+
+        self._fleet = get_fleet_schedule(hass)
+        self._fleet.add(config_entry.entry_id)
+
+        self._write_queue = TpLinkWriteQueue(hass, _WRITE_QUEUE_DELAY)
+        self._write_confirmation = Debouncer(
+            hass,
+            _LOGGER,
+            cooldown=_WRITE_CONFIRMATION_DELAY,
+            immediate=False,
+            function=self._async_confirm_writes,
         )
 
     @property
@@ -86,15 +284,11 @@ class TpLinkDataUpdateCoordinator(DataUpdateCoordinator):
 
     def get_port_state(self, number: int) -> PortState | None:
         """Return the specified port state."""
-        if number > self.ports_count or number < 1:
-            return None
-        return self._port_states[number - 1]
+        return self._port_states.get(number)
 
     def get_port_poe_state(self, number: int) -> PortPoeState | None:
         """Return the specified port PoE state."""
-        if number > self.ports_poe_count or number < 1:
-            return None
-        return self._port_poe_states[number - 1]
+        return self._port_poe_states.get(number)
 
     def get_switch_info(self) -> TpLinkSystemInfo | None:
         """Return the information of the switch."""
@@ -104,6 +298,96 @@ class TpLinkDataUpdateCoordinator(DataUpdateCoordinator):
         """Return the switch PoE state."""
         return self._poe_state
 
+    @property
+    def port_rates_enabled(self) -> bool:
+        """Return true if the port traffic statistics are collected."""
+        return self._port_rates is not None
+
+    def get_port_rates(self, number: int) -> PortRates | None:
+        """Return the specified port packet rates."""
+        if not self._port_rates:
+            return None
+        return self._port_rates.get(number)
+
+    def get_response_time(self) -> float | None:
+        """Return the smoothed time in seconds the switch takes to respond."""
+        return self._api.response_time
+
+    def get_metrics(self) -> TpLinkMetrics:
+        """Return the metrics of the requests to the switch."""
+        return self._api.metrics
+
+    def get_diagnostics(self) -> dict[str, Any]:
+        """Return the state of the connection to the switch."""
+        response_time = self._api.response_time
+        return {
+            "update_interval": self.update_interval.total_seconds(),
+            "response_time_ms": (
+                round(response_time * 1000, 1) if response_time is not None else None
+            ),
+            "idle_timeout": self._api.idle_timeout,
+            "max_concurrency": self._api.max_concurrency,
+            "session_generation": self._api.session_generation,
+            "metrics": self._api.metrics.as_dict(),
+        }
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: any = None
+    ) -> Callable[[], None]:
+        """Listen for data updates, skipping the ones that do not affect the port."""
+        if isinstance(context, TpLinkPortListenerContext):
+            update_callback = partial(
+                self._async_notify_port_listener, context, update_callback
+            )
+        return super().async_add_listener(update_callback, context)
+
+    @callback
+    def _async_notify_port_listener(
+        self, context: TpLinkPortListenerContext, update_callback: CALLBACK_TYPE
+    ) -> None:
+        """Call the port listener if the data it depends on has changed."""
+        if self._changes is not None:
+            changed_fields = self._changes.get((context.kind, context.number))
+            if not changed_fields:
+                return
+            if context.fields is not None and context.fields.isdisjoint(
+                changed_fields
+            ):
+                return
+        update_callback()
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update listeners affected by the changes since the previous notification."""
+        super().async_update_listeners()
+        self._changes = {}
+
+    def _record_changes(
+        self, kind: str, changes: dict[int, set[str]] | None
+    ) -> None:
+        """Remember the changed ports to notify their listeners."""
+        if changes is None:
+            self._changes = None
+        elif self._changes is not None:
+            for number, fields in changes.items():
+                self._changes.setdefault((kind, number), set()).update(fields)
+
+    def _set_port_states(self, port_states: PortStates) -> None:
+        """Replace the port states snapshot."""
+        self._record_changes(
+            LISTENER_KIND_PORT_STATE, self._port_states.changes(port_states)
+        )
+        self._port_states = port_states
+
+    def _set_port_poe_states(self, port_poe_states: PortPoeStates) -> None:
+        """Replace the port PoE states snapshot."""
+        self._record_changes(
+            LISTENER_KIND_PORT_POE_STATE,
+            self._port_poe_states.changes(port_poe_states),
+        )
+        self._port_poe_states = port_poe_states
+
     async def _safe_disconnect(self, api: TpLinkApi) -> None:
         """Disconnect from API."""
         try:
@@ -115,53 +399,239 @@ class TpLinkDataUpdateCoordinator(DataUpdateCoordinator):
         """Return true if specified feature is known and available."""
         return await self._api.is_feature_available(feature)
 
+    async def async_restore_session(self) -> None:
+        """Reuse the session saved before the restart, if any."""
+        if not self._session_store:
+            return
+        data = await self._session_store.async_load()
+        if data and data.get("cookies") is not None:
+            _LOGGER.debug("Found saved session")
+            await self._api.restore_session(data["cookies"])
+
+    def take_over(self, other: "TpLinkDataUpdateCoordinator") -> None:
+        """Continue with the session and the data of the coordinator of a failed setup."""
+        other._cancel_keepalive()
+        self._api = other._api
+        self._capabilities = other._capabilities
+        self._switch_info = other._switch_info
+        self._switch_info_updated_at = other._switch_info_updated_at
+        self._port_states = other._port_states
+        self._port_poe_states = other._port_poe_states
+        self._poe_state = other._poe_state
+        self._port_rates = other._port_rates
+        self._saved_session_generation = other._saved_session_generation
+        self._adaptive_interval = other._adaptive_interval
+        self.update_interval = other.update_interval
+        self.data = other.data
+        self.last_update_success = other.last_update_success
+        self._schedule_keepalive()
+
+    def _save_session(self) -> None:
+        """Schedule saving of the session if it has been renewed."""
+        generation = self._api.session_generation
+        if not self._session_store or generation == self._saved_session_generation:
+            return
+        self._saved_session_generation = generation
+        self._session_store.async_delay_save(
+            lambda: {"cookies": self._api.export_session()}, SESSION_SAVE_DELAY
+        )
+
     async def async_update(self) -> None:
         """Asynchronous update of all data."""
         _LOGGER.debug("Update started")
-        await self._update_switch_info()
-        await self._update_port_states()
-        await self._update_poe_state()
-        await self._update_port_poe_states()
+        if not self.last_update_success:
+            self._changes = None
+        try:
+            async with self._fleet.refresh_slot():
+                await self._async_update_all()
+        except Exception:
+            self._changes = None
+            raise
+        finally:
+            self._adapt_update_interval()
+            self._save_session()
+            self._schedule_keepalive()
         _LOGGER.debug("Update completed")
 
+    def _is_ports_activity_detected(self) -> bool:
+        """Return true if a link or PoE power state has changed during the update."""
+        if self._changes is None:
+            # the update failed or all data was replaced, no port is known to change,
+            # so failing switches are polled less often
+            return False
+        for (kind, _), fields in self._changes.items():
+            activity_fields = _ACTIVITY_FIELDS.get(kind)
+            if activity_fields and not activity_fields.isdisjoint(fields):
+                return True
+        return False
+
+    def _adapt_update_interval(self) -> None:
+        """Choose the next update interval and align it to the switch phase in the fleet."""
+        interval = self._base_update_interval
+        if self._adaptive_interval:
+            interval = self._adaptive_interval.update(
+                self._is_ports_activity_detected(), self._api.response_time
+            )
+        self.update_interval = self._fleet.align(
+            self.config_entry.entry_id, interval, self.hass.loop.time()
+        )
+        _LOGGER.debug("Next update in %s", self.update_interval)
+
+    async def _async_update_all(self) -> None:
+        """Fetch all data during a single page snapshot."""
+        async with self._api.snapshot():
+            results = await asyncio.gather(
+                self._update_switch_info(),
+                self._update_port_states(),
+                self._update_poe_state(),
+                self._update_port_poe_states(),
+                self._update_port_statistics(),
+                return_exceptions=True,
+            )
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+            # None means the page was not due, False that it could not be read
+            reads = [result for result in results if result is not None]
+            if reads and not any(reads):
+                raise UpdateFailed("Can not read any page of the switch")
+            await self._async_check_capabilities()
+
+    async def _async_check_capabilities(self) -> None:
+        """Detect the capabilities again if the switch firmware has changed."""
+        switch_info = self._switch_info
+        cached = self._capabilities
+        if switch_info is None or switch_info.firmware is None:
+            return
+        if cached and (cached.mac, cached.firmware) == (
+            switch_info.mac,
+            switch_info.firmware,
+        ):
+            return
+
+        _LOGGER.debug("Firmware %s not seen before", switch_info.firmware)
+        capabilities = await self._api.detect_capabilities()
+        self._capabilities = capabilities
+        entry = self.config_entry
+        self.hass.config_entries.async_update_entry(
+            entry, data={**entry.data, CONF_CAPABILITIES: capabilities.as_dict()}
+        )
+        if (
+            cached
+            and replace(capabilities, firmware=cached.firmware) != cached
+            and entry.state is ConfigEntryState.LOADED
+        ):
+            _LOGGER.debug("Capabilities changed, reloading %s", entry.title)
+            self.hass.config_entries.async_schedule_reload(entry.entry_id)
+
+    @callback
+    def _cancel_keepalive(self) -> None:
+        if self._keepalive_unsub:
+            self._keepalive_unsub()
+            self._keepalive_unsub = None
+
+    @callback
+    def _schedule_keepalive(self) -> None:
+        """Keep the session alive if it would expire before the next update."""
+        self._cancel_keepalive()
+        delay = self._api.keepalive_delay()
+        if delay is None or delay >= self.update_interval.total_seconds():
+            return
+        self._keepalive_unsub = async_call_later(
+            self.hass, delay, self._async_keepalive
+        )
+
+    async def _async_keepalive(self, _now: datetime) -> None:
+        """Keep the session alive between updates."""
+        self._keepalive_unsub = None
+        try:
+            await self._api.keepalive()
+        except Exception as ex:
+            _LOGGER.debug("Keepalive failed: %s", str(ex))
+        self._save_session()
+        self._schedule_keepalive()
+
     async def async_unload(self) -> None:
         """Unload the coordinator and disconnect from API."""
+        self._fleet.remove(self.config_entry.entry_id)
+        self._cancel_keepalive()
+        await self._write_queue.async_flush()
+        self._write_confirmation.async_cancel()
         await self._safe_disconnect(self._api)
 
-    async def _update_switch_info(self):
-        """Update the switch info."""
+    def request_switch_info_update(self) -> None:
+        """Refresh the switch info during the next update regardless of its age."""
+        self._is_switch_info_update_requested = True
+
+    def _is_switch_info_outdated(self) -> bool:
+        """Return true if the switch info should be fetched during this update."""
+        if self._switch_info is None or self._is_switch_info_update_requested:
+            return True
+        return dt_util.utcnow() - self._switch_info_updated_at >= (
+            self._switch_info_interval
+        )
+
+    async def _update_switch_info(self) -> bool | None:
+        """Update the switch info, return None if it is not outdated yet."""
+        if not self._is_switch_info_outdated():
+            return None
         self._switch_info = await self._api.get_device_info()
+        self._switch_info_updated_at = dt_util.utcnow()
+        self._is_switch_info_update_requested = False
+        return True
 
-    async def _update_port_states(self):
-        """Update port states."""
+    async def _update_port_states(self) -> bool:
+        """Update port states, return false if they could not be read."""
         try:
-            self._port_states = await self._api.get_port_states()
+            self._set_port_states(await self._api.get_port_states())
         except Exception as ex:
             _LOGGER.warning("Can not get port states: %s", repr(ex))
-            self._port_states = []
+            self._set_port_states(PortStates())
+            return False
+        return True
 
-    async def _update_poe_state(self):
-        """Update the switch PoE state."""
+    async def _update_poe_state(self) -> bool | None:
+        """Update the switch PoE state, return false if it could not be read."""
 
         if not await self.is_feature_available(FEATURE_POE):
-            return
+            return None
 
         try:
             self._poe_state = await self._api.get_poe_state()
         except Exception as ex:
             _LOGGER.warning("Can not get poe state: %s", repr(ex))
+            return False
+        return True
 
-    async def _update_port_poe_states(self):
-        """Update port PoE states."""
+    async def _update_port_poe_states(self) -> bool | None:
+        """Update port PoE states, return false if they could not be read."""
 
         if not await self.is_feature_available(FEATURE_POE):
-            return
+            return None
 
         try:
-            self._port_poe_states = await self._api.get_port_poe_states()
+            self._set_port_poe_states(await self._api.get_port_poe_states())
         except Exception as ex:
             _LOGGER.warning("Can not get port poe states: %s", repr(ex))
-            self._port_poe_states = []
+            self._set_port_poe_states(PortPoeStates())
+            return False
+        return True
+
+    async def _update_port_statistics(self) -> bool | None:
+        """Update port packet rates, return false if the counters could not be read."""
+        if not self._port_rates:
+            return None
+
+        try:
+            statistics = await self._api.get_port_statistics()
+        except Exception as ex:
+            _LOGGER.warning("Can not get port statistics: %s", repr(ex))
+            return False
+        self._record_changes(
+            LISTENER_KIND_PORT_RATES,
+            self._port_rates.update(statistics, time.monotonic()),
+        )
+        return True
 
     def get_device_info(self) -> DeviceInfo | None:
         """Return the DeviceInfo."""
@@ -180,6 +650,76 @@ class TpLinkDataUpdateCoordinator(DataUpdateCoordinator):
         )
         return result
 
+    async def _async_write(
+        self,
+        write: Callable[[], Awaitable[None]],
+        apply: Callable[[], None],
+        revert: Callable[[], None],
+        written: dict[tuple[str, int], set[str]],
+    ) -> None:
+        """Show the written data right away and confirm it with a deferred read."""
+        apply()
+        self.async_update_listeners()
+        try:
+            await write()
+        except Exception:
+            revert()
+            self.async_update_listeners()
+            raise
+
+        for key, fields in written.items():
+            self._unconfirmed_writes.setdefault(key, set()).update(fields)
+        # restart the timer, so the read back happens after the last write of a burst
+        self._write_confirmation.async_cancel()
+        await self._write_confirmation.async_call()
+
+    async def _async_confirm_writes(self) -> None:
+        """Read back the written data, rolling back what the switch has not applied."""
+        written, self._unconfirmed_writes = self._unconfirmed_writes, {}
+        kinds = {kind for kind, _ in written}
+        port_states = self._port_states
+        port_poe_states = self._port_poe_states
+        poe_state = self._poe_state
+
+        updates = []
+        if LISTENER_KIND_PORT_STATE in kinds:
+            updates.append(self._update_port_states())
+        if LISTENER_KIND_PORT_POE_STATE in kinds:
+            updates.append(self._update_port_poe_states())
+        if _WRITE_KIND_POE_STATE in kinds:
+            updates.append(self._update_poe_state())
+        if not updates:
+            return
+
+        _LOGGER.debug("Confirming written data")
+        # the pages of a refresh running meanwhile may predate the writes
+        async with self._api.snapshot(exclusive=True):
+            await asyncio.gather(*updates)
+
+        differences: dict[str, dict[int, set[str]] | None] = {
+            LISTENER_KIND_PORT_STATE: port_states.changes(self._port_states),
+            LISTENER_KIND_PORT_POE_STATE: port_poe_states.changes(
+                self._port_poe_states
+            ),
+            _WRITE_KIND_POE_STATE: (
+                {0: {"power_limit"}}
+                if poe_state
+                and self._poe_state
+                and poe_state.power_limit != self._poe_state.power_limit
+                else {}
+            ),
+        }
+        for (kind, number), fields in written.items():
+            difference = (differences[kind] or {}).get(number)
+            if difference and not fields.isdisjoint(difference):
+                _LOGGER.warning(
+                    "Switch has not applied %s of %s #%s, rolled back",
+                    ", ".join(sorted(fields & difference)),
+                    kind,
+                    number,
+                )
+        self.async_update_listeners()
+
     async def set_port_state(
         self,
         number: int,
@@ -188,20 +728,83 @@ class TpLinkDataUpdateCoordinator(DataUpdateCoordinator):
         flow_control_config: bool,
     ) -> None:
         """Set the port state."""
-        await self._api.set_port_state(
-            number, enabled, speed_config, flow_control_config
+        await self.async_set_port_states(
+            [PortStateChange(number, enabled, speed_config, flow_control_config)]
         )
 
-        index = number - 1
-        if len(self._port_states) >= index:
-            self._port_states[index].enabled = enabled
-            self.async_update_listeners()
+    async def async_set_port_states(self, changes: list[PortStateChange]) -> None:
+        """Set the states of several ports at once."""
+        await asyncio.gather(
+            *(
+                self._write_queue.async_enqueue(
+                    (LISTENER_KIND_PORT_STATE, change.number),
+                    change,
+                    self._async_write_port_states,
+                )
+                for change in changes
+            )
+        )
+
+    async def _async_write_port_states(self, changes: list[PortStateChange]) -> None:
+        """Write the port states."""
+        previous = self._port_states
+        expected = previous
+        written = {}
+        for change in changes:
+            written[(LISTENER_KIND_PORT_STATE, change.number)] = {
+                "enabled",
+                "speed_config",
+                "flow_control_config",
+            }
+            if expected.get(change.number) is not None:
+                expected = expected.copy_with(
+                    change.number,
+                    enabled=change.enabled,
+                    speed_config=change.speed_config,
+                    flow_control_config=change.flow_control_config,
+                )
+
+        def revert() -> None:
+            if self._port_states is expected:
+                self._set_port_states(previous)
+
+        await self._async_write(
+            partial(self._api.set_port_states, changes),
+            partial(self._set_port_states, expected),
+            revert,
+            written,
+        )
 
     async def async_set_poe_limit(self, limit: float) -> None:
         """Set general PoE limit."""
-        await self._api.set_poe_limit(limit)
-        await self._update_poe_state()
-        self.async_update_listeners()
+        await self._write_queue.async_enqueue(
+            (_WRITE_KIND_POE_STATE, 0), limit, self._async_write_poe_limit
+        )
+
+    async def _async_write_poe_limit(self, limits: list[float]) -> None:
+        """Write the last queued general PoE limit."""
+        limit = limits[-1]
+        previous = self._poe_state
+        expected = previous and replace(
+            previous,
+            power_limit=limit,
+            power_remain=limit - previous.power_consumption,
+        )
+
+        def apply() -> None:
+            if expected:
+                self._poe_state = expected
+
+        def revert() -> None:
+            if expected and self._poe_state is expected:
+                self._poe_state = previous
+
+        await self._async_write(
+            partial(self._api.set_poe_limit, limit),
+            apply,
+            revert,
+            {(_WRITE_KIND_POE_STATE, 0): {"power_limit"}},
+        )
 
     async def async_set_port_poe_settings(
         self,
@@ -211,8 +814,67 @@ class TpLinkDataUpdateCoordinator(DataUpdateCoordinator):
         power_limit: PoePowerLimit | float,
     ) -> None:
         """Set the port PoE settings."""
-        await self._api.set_port_poe_settings(
-            port_number, enabled, priority, power_limit
+        await self.async_set_ports_poe_settings(
+            [port_number], enabled, priority, power_limit
+        )
+
+    async def async_set_ports_poe_settings(
+        self,
+        port_numbers: list[int],
+        enabled: bool,
+        priority: PoePriority,
+        power_limit: PoePowerLimit | float,
+    ) -> None:
+        """Set the same PoE settings of several ports."""
+        settings = (enabled, priority, power_limit)
+        await asyncio.gather(
+            *(
+                self._write_queue.async_enqueue(
+                    (LISTENER_KIND_PORT_POE_STATE, port_number),
+                    (port_number, settings),
+                    self._async_write_ports_poe_settings,
+                    settings,
+                )
+                for port_number in port_numbers
+            )
+        )
+
+    async def _async_write_ports_poe_settings(
+        self, values: list[tuple[int, tuple[bool, PoePriority, PoePowerLimit | float]]]
+    ) -> None:
+        """Write the same PoE settings of the queued ports."""
+        port_numbers = [port_number for port_number, _ in values]
+        enabled, priority, power_limit = values[0][1]
+        previous = self._port_poe_states
+        expected = previous
+        written = {}
+        for port_number in port_numbers:
+            written[(LISTENER_KIND_PORT_POE_STATE, port_number)] = {
+                "enabled",
+                "priority",
+                "power_limit",
+            }
+            if expected.get(port_number) is not None:
+                expected = expected.copy_with(
+                    port_number,
+                    enabled=enabled,
+                    priority=priority,
+                    power_limit=power_limit,
+                )
+
+        def revert() -> None:
+            if self._port_poe_states is expected:
+                self._set_port_poe_states(previous)
+
+        await self._async_write(
+            partial(
+                self._api.set_ports_poe_settings,
+                port_numbers,
+                enabled,
+                priority,
+                power_limit,
+            ),
+            partial(self._set_port_poe_states, expected),
+            revert,
+            written,
         )
-        await self._update_port_poe_states()
-        self.async_update_listeners()
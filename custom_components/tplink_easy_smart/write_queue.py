@@ -0,0 +1,108 @@
+"""Write coalescing for TP-Link."""
+
+import asyncio
+from datetime import datetime
+from functools import partial
+import logging
+from typing import Any, Awaitable, Callable, Hashable, TypeAlias
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+_LOGGER = logging.getLogger(__name__)
+
+Writer: TypeAlias = Callable[[list[Any]], Awaitable[None]]
+
+
+# ---------------------------
+#   _copy_result
+# ---------------------------
+def _copy_result(target: asyncio.Future[None], source: asyncio.Future[None]) -> None:
+    """Complete the target future like the source one."""
+    if target.done():
+        return
+    if source.cancelled():
+        target.cancel()
+    elif source.exception() is not None:
+        target.set_exception(source.exception())
+    else:
+        target.set_result(None)
+
+
+# ---------------------------
+#   TpLinkWriteQueue
+# ---------------------------
+class TpLinkWriteQueue:
+    """Collects the writes made within a short window and applies them in batches.
+
+    Writes are merged per target, the last queued value wins. The values queued
+    with the same writer and group are passed to a single writer call.
+    """
+
+    def __init__(self, hass: HomeAssistant, delay: float) -> None:
+        """Initialize."""
+        self._hass = hass
+        self._delay = delay
+        self._pending: dict[
+            Hashable, tuple[Writer, Hashable, Any, asyncio.Future[None]]
+        ] = {}
+        self._flush_unsub: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_enqueue(
+        self, target: Hashable, value: Any, writer: Writer, group: Hashable = None
+    ) -> asyncio.Future[None]:
+        """Queue the value for the target and return the future of its write."""
+        future: asyncio.Future[None] = self._hass.loop.create_future()
+        superseded = self._pending.pop(target, None)
+        if superseded:
+            _LOGGER.debug("Queued write to %s superseded", target)
+            future.add_done_callback(partial(_copy_result, superseded[3]))
+        self._pending[target] = (writer, group, value, future)
+
+        if not self._flush_unsub:
+            self._flush_unsub = async_call_later(
+                self._hass, self._delay, self._async_flush_later
+            )
+        return future
+
+    async def _async_flush_later(self, _now: datetime) -> None:
+        self._flush_unsub = None
+        await self.async_flush()
+
+    async def async_flush(self) -> None:
+        """Apply all queued writes."""
+        if self._flush_unsub:
+            self._flush_unsub()
+            self._flush_unsub = None
+
+        pending, self._pending = self._pending, {}
+        batches: dict[tuple[Writer, Hashable], list[tuple[Any, asyncio.Future]]] = {}
+        for writer, group, value, future in pending.values():
+            batches.setdefault((writer, group), []).append((value, future))
+
+        _LOGGER.debug(
+            "Flushing %s write(s) in %s batch(es)", len(pending), len(batches)
+        )
+        await asyncio.gather(
+            *(
+                self._async_write(writer, items)
+                for (writer, _), items in batches.items()
+            )
+        )
+
+    @staticmethod
+    async def _async_write(
+        writer: Writer, items: list[tuple[Any, asyncio.Future]]
+    ) -> None:
+        try:
+            await writer([value for value, _ in items])
+        except Exception as ex:
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(ex)
+        else:
+            for _, future in items:
+                if not future.done():
+                    future.set_result(None)
+
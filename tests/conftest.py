@@ -0,0 +1,14 @@
+"""Shared test setup.
+
+The client package does not depend on Home Assistant, its tests import it as
+the top level `client` package like the benchmarks do. The tests of the
+integration modules need Home Assistant, and the ones using the `hass` fixture
+need pytest-homeassistant-custom-component; they are skipped without them.
+"""
+
+import pathlib
+import sys
+
+_ROOT = pathlib.Path(__file__).parents[1]
+
+sys.path[:0] = [str(_ROOT), str(_ROOT / "custom_components" / "tplink_easy_smart")]
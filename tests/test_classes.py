@@ -0,0 +1,115 @@
+"""Tests of the columnar port snapshots."""
+
+import pytest
+
+from client.classes import (
+    PoePowerLimit,
+    PoePriority,
+    PortPoeStates,
+    PortSpeed,
+    PortStates,
+)
+
+
+def _port_states(enabled=(1, 1, 0)) -> PortStates:
+    count = len(enabled)
+    return PortStates(
+        enabled=enabled,
+        flow_control_config=[0] * count,
+        flow_control_actual=[0] * count,
+        speed_config=[PortSpeed.AUTO] * count,
+        speed_actual=[PortSpeed.FULL_1000M] * count,
+    )
+
+
+def _port_poe_states(count: int = 4) -> PortPoeStates:
+    return PortPoeStates(
+        enabled=[1] * count,
+        priority=[PoePriority.LOW] * count,
+        power_limit=[PoePowerLimit.AUTO] * count,
+        power=[0] * count,
+        current=[0] * count,
+        voltage=[0] * count,
+        pd_class=[0] * count,
+        power_status=[0] * count,
+    )
+
+
+def test_columns_length_mismatch() -> None:
+    with pytest.raises(ValueError):
+        PortStates(enabled=(1, 1), flow_control_config=(0,))
+
+
+def test_changes_none() -> None:
+    assert _port_states().changes(_port_states()) == {}
+
+
+def test_changes_fields() -> None:
+    old = _port_states()
+    new = PortStates(
+        enabled=(1, 0, 0),
+        flow_control_config=(0, 0, 0),
+        flow_control_actual=(0, 0, 0),
+        speed_config=(PortSpeed.AUTO,) * 3,
+        speed_actual=(PortSpeed.FULL_1000M, PortSpeed.LINK_DOWN, PortSpeed.FULL_1000M),
+    )
+
+    assert old.changes(new) == {2: {"enabled", "speed_actual"}}
+
+
+def test_changes_ports_count() -> None:
+    assert _port_states().changes(_port_states((1, 1))) is None
+
+
+def test_copy_with() -> None:
+    states = _port_states()
+    result = states.copy_with(
+        3, enabled=True, speed_config=PortSpeed.FULL_100M, flow_control_config=True
+    )
+
+    port = result.get(3)
+    assert port.enabled
+    assert port.speed_config == PortSpeed.FULL_100M
+    assert port.flow_control_config
+    assert states.changes(result) == {
+        3: {"enabled", "speed_config", "flow_control_config"}
+    }
+    assert not states.get(3).enabled
+
+
+def test_copy_with_keeps_unset_fields() -> None:
+    states = _port_states()
+
+    assert states.changes(states.copy_with(1, enabled=False)) == {1: {"enabled"}}
+
+
+@pytest.mark.parametrize("number", [0, -1, 4])
+def test_copy_with_out_of_range(number: int) -> None:
+    states = _port_states()
+
+    with pytest.raises(IndexError):
+        states.copy_with(number, enabled=False)
+
+
+def test_get_out_of_range() -> None:
+    states = _port_states()
+
+    assert states.get(0) is None
+    assert states.get(4) is None
+    assert states.get(3).number == 3
+
+
+def test_poe_copy_with() -> None:
+    states = _port_poe_states()
+    manual = states.copy_with(2, power_limit=12.3)
+    updated = manual.copy_with(2, enabled=False, priority=PoePriority.HIGH)
+
+    assert manual.get(2).power_limit == pytest.approx(12.3)
+    assert updated.get(2).priority == PoePriority.HIGH
+    assert states.changes(updated) == {2: {"enabled", "priority", "power_limit"}}
+
+
+@pytest.mark.parametrize("number", [0, 5])
+def test_poe_copy_with_out_of_range(number: int) -> None:
+    with pytest.raises(IndexError):
+        _port_poe_states().copy_with(number, enabled=False)
@@ -0,0 +1,116 @@
+"""Tests of the page parsing functions."""
+
+import json5
+import pytest
+
+from client.parser import VariablesStreamExtractor, extract_variables, parse_literal
+
+_PAGE = """<html>
+<head>
+<script type="text/javascript" src="../js/tplink.js"></script>
+<script>
+var info_ds = {
+descriStr:[
+"TL-SG108PE"
+],
+macStr:[
+"AA-BB-CC-DD-EE-08"
+]
+};
+var tip = "a; b";
+var max_port_num = 8;
+</script>
+</head>
+<body>
+<script>
+var all_info = {state:[1,0,1,1,1,1,1,1,0,0]};
+</script>
+</body>
+</html>
+"""
+
+
+@pytest.mark.parametrize(
+    "literal",
+    [
+        "{}",
+        "[]",
+        "[1,2,]",
+        "{a:1,b:[1,2,3,],}",
+        '{descriStr:[\n"TL-SG108PE"\n],\n}',
+        "{s:'x:y, ]', t:\"it's, }\"}",
+        "{$k:-1, _u: 0.5, n: null, b: true, f: false}",
+        "{a:{b:{c:[[],[1]]}}}",
+        '{"q":"a\\"b:c"}',
+        "{a:'\"'}",
+        "{a:'',b:\"\"}",
+        '{a:"\\u0041"}',
+        '{ key : "x" , }',
+        # not handled by the fast path, parsed by json5
+        "{a:0x10}",
+        "{a:1 /* c */}",
+        "{a:'it\\'s'}",
+        "{a: .5}",
+        "{a: +1}",
+        "{a:Infinity}",
+    ],
+)
+def test_parse_literal_matches_json5(literal: str) -> None:
+    assert parse_literal(literal) == json5.loads(literal)
+
+
+def test_parse_literal_invalid() -> None:
+    with pytest.raises(ValueError):
+        parse_literal("{a:}")
+
+
+def test_extract_variables() -> None:
+    variables = extract_variables(_PAGE)
+
+    assert variables["tip"] == '"a; b"'
+    assert variables["max_port_num"] == "8"
+    assert parse_literal(variables["info_ds"]) == {
+        "descriStr": ["TL-SG108PE"],
+        "macStr": ["AA-BB-CC-DD-EE-08"],
+    }
+    assert parse_literal(variables["all_info"])["state"][0] == 1
+
+
+def test_extract_variables_unclosed_script() -> None:
+    assert extract_variables("<script>var a = 1;\nvar b = [2];") == {
+        "a": "1",
+        "b": "[2]",
+    }
+
+
+def test_extract_variables_empty() -> None:
+    assert extract_variables("") == {}
+    assert extract_variables("<html>var a = 1;</html>") == {}
+
+
+@pytest.mark.parametrize("part_size", [1, 7, 64, len(_PAGE)])
+def test_stream_extractor_matches_extract_variables(part_size: int) -> None:
+    extractor = VariablesStreamExtractor(set())
+    for start in range(0, len(_PAGE), part_size):
+        extractor.feed(_PAGE[start : start + part_size])
+    extractor.close()
+
+    assert extractor.variables == extract_variables(_PAGE)
+    assert extractor.page == _PAGE
+
+
+def test_stream_extractor_stops_at_wanted_variables() -> None:
+    extractor = VariablesStreamExtractor({"info_ds", "tip"})
+    head, _, _ = _PAGE.partition("<body>")
+
+    assert extractor.feed(head)
+    assert extractor.is_complete
+    assert "all_info" not in extractor.variables
+
+
+def test_stream_extractor_stops_at_final_variable() -> None:
+    extractor = VariablesStreamExtractor({"all_info"}, final=("info_ds",))
+    head, _, _ = _PAGE.partition("<body>")
+
+    assert extractor.feed(head)
+    assert "all_info" not in extractor.variables
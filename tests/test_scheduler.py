@@ -0,0 +1,230 @@
+"""Tests of the requests scheduler."""
+
+import asyncio
+
+import pytest
+
+from client.scheduler import RequestPriority, RequestScheduler
+
+
+class _Recorder:
+    """Records the order in which the requests are performed."""
+
+    def __init__(self) -> None:
+        self.started: list[str] = []
+        self.gate = asyncio.Event()
+
+    def request(self, name: str, wait: bool = False):
+        async def perform() -> str:
+            self.started.append(name)
+            if wait:
+                await self.gate.wait()
+            return name
+
+        return perform
+
+
+def _run(coroutine) -> None:
+    asyncio.run(coroutine)
+
+
+def test_priority_order() -> None:
+    async def scenario() -> None:
+        scheduler = RequestScheduler(1)
+        recorder = _Recorder()
+        blocker = asyncio.create_task(scheduler.run(recorder.request("blocker", True)))
+        await asyncio.sleep(0)
+        poll = asyncio.create_task(
+            scheduler.run(recorder.request("poll"), RequestPriority.POLL)
+        )
+        user = asyncio.create_task(
+            scheduler.run(recorder.request("user"), RequestPriority.USER)
+        )
+        session = asyncio.create_task(
+            scheduler.run(recorder.request("session"), RequestPriority.SESSION)
+        )
+        await asyncio.sleep(0)
+        recorder.gate.set()
+        await asyncio.gather(blocker, poll, user, session)
+
+        assert recorder.started == ["blocker", "session", "user", "poll"]
+
+    _run(scenario())
+
+
+def test_limit() -> None:
+    async def scenario() -> None:
+        scheduler = RequestScheduler(2)
+        recorder = _Recorder()
+        tasks = [
+            asyncio.create_task(scheduler.run(recorder.request(str(n), True)))
+            for n in range(4)
+        ]
+        await asyncio.sleep(0.01)
+
+        assert recorder.started == ["0", "1"]
+        assert scheduler.active == 2
+
+        recorder.gate.set()
+        assert await asyncio.gather(*tasks) == ["0", "1", "2", "3"]
+        assert scheduler.active == 0
+
+    _run(scenario())
+
+
+def test_supersede() -> None:
+    async def scenario() -> None:
+        scheduler = RequestScheduler(1)
+        recorder = _Recorder()
+        blocker = asyncio.create_task(scheduler.run(recorder.request("blocker", True)))
+        await asyncio.sleep(0)
+        older = asyncio.create_task(scheduler.run(recorder.request("older"), key="k"))
+        newer = asyncio.create_task(scheduler.run(recorder.request("newer"), key="k"))
+        await asyncio.sleep(0)
+        recorder.gate.set()
+
+        assert await asyncio.gather(older, newer) == ["newer", "newer"]
+        assert recorder.started == ["blocker", "newer"]
+        await blocker
+
+    _run(scenario())
+
+
+def test_supersede_raises_priority() -> None:
+    async def scenario() -> None:
+        scheduler = RequestScheduler(1)
+        recorder = _Recorder()
+        blocker = asyncio.create_task(scheduler.run(recorder.request("blocker", True)))
+        await asyncio.sleep(0)
+        keyed = asyncio.create_task(scheduler.run(recorder.request("old"), key="k"))
+        other = asyncio.create_task(scheduler.run(recorder.request("other")))
+        newer = asyncio.create_task(
+            scheduler.run(recorder.request("new"), RequestPriority.USER, "k")
+        )
+        await asyncio.sleep(0)
+        recorder.gate.set()
+        await asyncio.gather(blocker, keyed, other, newer)
+
+        assert recorder.started == ["blocker", "new", "other"]
+
+    _run(scenario())
+
+
+def test_running_request_is_not_superseded() -> None:
+    async def scenario() -> None:
+        scheduler = RequestScheduler(1)
+        recorder = _Recorder()
+        running = asyncio.create_task(
+            scheduler.run(recorder.request("running", True), key="k")
+        )
+        await asyncio.sleep(0)
+        queued = asyncio.create_task(scheduler.run(recorder.request("queued"), key="k"))
+        await asyncio.sleep(0)
+        recorder.gate.set()
+
+        assert await asyncio.gather(running, queued) == ["running", "queued"]
+
+    _run(scenario())
+
+
+def test_cancel_queued() -> None:
+    async def scenario() -> None:
+        scheduler = RequestScheduler(1)
+        recorder = _Recorder()
+        blocker = asyncio.create_task(scheduler.run(recorder.request("blocker", True)))
+        await asyncio.sleep(0)
+        cancelled = asyncio.create_task(scheduler.run(recorder.request("cancelled")))
+        kept = asyncio.create_task(scheduler.run(recorder.request("kept")))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        recorder.gate.set()
+        await asyncio.gather(blocker, kept)
+
+        assert cancelled.cancelled()
+        assert recorder.started == ["blocker", "kept"]
+
+    _run(scenario())
+
+
+def test_cancel_one_of_superseding_waiters() -> None:
+    async def scenario() -> None:
+        scheduler = RequestScheduler(1)
+        recorder = _Recorder()
+        blocker = asyncio.create_task(scheduler.run(recorder.request("blocker", True)))
+        await asyncio.sleep(0)
+        first = asyncio.create_task(scheduler.run(recorder.request("first"), key="k"))
+        second = asyncio.create_task(scheduler.run(recorder.request("second"), key="k"))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        recorder.gate.set()
+
+        assert await second == "second"
+        assert recorder.started == ["blocker", "second"]
+        await blocker
+
+    _run(scenario())
+
+
+def test_cancel_running() -> None:
+    async def scenario() -> None:
+        scheduler = RequestScheduler(1)
+        recorder = _Recorder()
+        running = asyncio.create_task(scheduler.run(recorder.request("running", True)))
+        await asyncio.sleep(0.01)
+        running.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await running
+        await asyncio.sleep(0)
+
+        assert scheduler.active == 0
+        assert await scheduler.run(recorder.request("next")) == "next"
+
+    _run(scenario())
+
+
+def test_exception_is_returned_to_caller() -> None:
+    async def scenario() -> None:
+        scheduler = RequestScheduler(1)
+
+        async def fail() -> None:
+            raise RuntimeError("failed")
+
+        with pytest.raises(RuntimeError):
+            await scheduler.run(fail)
+        assert scheduler.active == 0
+
+    _run(scenario())
+
+
+def test_exclusive_runs_alone() -> None:
+    async def scenario() -> None:
+        scheduler = RequestScheduler(2)
+        recorder = _Recorder()
+        running = [
+            asyncio.create_task(scheduler.run(recorder.request(name, True)))
+            for name in ("a", "b")
+        ]
+        await asyncio.sleep(0.01)
+        overlaps = []
+
+        async def exclusive() -> None:
+            overlaps.append(scheduler.active)
+            recorder.started.append("exclusive")
+
+        session = asyncio.create_task(
+            scheduler.run(exclusive, RequestPriority.SESSION, exclusive=True)
+        )
+        later = asyncio.create_task(scheduler.run(recorder.request("later")))
+        await asyncio.sleep(0.01)
+
+        assert recorder.started == ["a", "b"]
+
+        recorder.gate.set()
+        await asyncio.gather(*running, session, later)
+
+        assert recorder.started == ["a", "b", "exclusive", "later"]
+        assert overlaps == [1]
+
+    _run(scenario())
@@ -0,0 +1,90 @@
+"""Tests of the port traffic rates."""
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.tplink_easy_smart.client.classes import (  # noqa: E402
+    PortStatistics,
+)
+from custom_components.tplink_easy_smart.traffic import (  # noqa: E402
+    PortRates,
+    TpLinkPortRates,
+)
+
+_WRAP: int = 1 << 32
+
+
+def _statistics(*ports: tuple[int, int, int, int]) -> PortStatistics:
+    return PortStatistics([counter for port in ports for counter in port])
+
+
+def test_first_sample_has_no_rates() -> None:
+    rates = TpLinkPortRates(1)
+
+    assert rates.update(_statistics((0, 0, 0, 0)), 10.0) is None
+    assert rates.get(1) is None
+
+
+def test_rates() -> None:
+    rates = TpLinkPortRates(1)
+    rates.update(_statistics((100, 0, 200, 0), (0, 0, 0, 0)), 10.0)
+
+    changes = rates.update(_statistics((300, 2, 600, 0), (0, 0, 0, 0)), 12.0)
+
+    assert rates.get(1) == PortRates(tx=100.0, tx_errors=1.0, rx=200.0, rx_errors=0.0)
+    assert rates.get(2) == PortRates(0.0, 0.0, 0.0, 0.0)
+    assert changes == {
+        1: {"tx", "tx_errors", "rx", "rx_errors"},
+        2: {"tx", "tx_errors", "rx", "rx_errors"},
+    }
+    assert rates.update(_statistics((500, 4, 1000, 0), (0, 0, 0, 0)), 14.0) == {}
+
+
+def test_counter_wrap() -> None:
+    rates = TpLinkPortRates(1)
+    rates.update(_statistics((_WRAP - 10, 0, 0, 0)), 0.0)
+    rates.update(_statistics((5, 0, 0, 0)), 1.0)
+
+    assert rates.get(1).tx == 15.0
+
+
+def test_counter_reset() -> None:
+    rates = TpLinkPortRates(1)
+    rates.update(_statistics((1000, 0, 0, 0)), 0.0)
+    rates.update(_statistics((5, 0, 0, 0)), 1.0)
+
+    assert rates.get(1).tx == 5.0
+
+
+def test_window_average() -> None:
+    rates = TpLinkPortRates(2)
+    rates.update(_statistics((0, 0, 0, 0)), 0.0)
+    rates.update(_statistics((100, 0, 0, 0)), 1.0)
+    rates.update(_statistics((400, 0, 0, 0)), 2.0)
+
+    assert rates.get(1).tx == 200.0
+
+    # the first interval leaves the window
+    rates.update(_statistics((500, 0, 0, 0)), 4.0)
+
+    assert rates.get(1).tx == pytest.approx(400 / 3, abs=0.01)
+
+
+def test_stale_sample_is_ignored() -> None:
+    rates = TpLinkPortRates(1)
+    rates.update(_statistics((0, 0, 0, 0)), 5.0)
+    rates.update(_statistics((100, 0, 0, 0)), 6.0)
+
+    assert rates.update(_statistics((200, 0, 0, 0)), 6.0) == {}
+    assert rates.get(1).tx == 100.0
+
+
+def test_ports_count_change_resets() -> None:
+    rates = TpLinkPortRates(1)
+    rates.update(_statistics((0, 0, 0, 0)), 0.0)
+    rates.update(_statistics((100, 0, 0, 0)), 1.0)
+
+    assert rates.update(_statistics((0, 0, 0, 0), (0, 0, 0, 0)), 2.0) is None
+    assert rates.get(1) is None
+    assert rates.get(3) is None
@@ -0,0 +1,87 @@
+"""Tests of the write coalescing queue."""
+
+from datetime import timedelta
+
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+from homeassistant.util import dt as dt_util  # noqa: E402
+from pytest_homeassistant_custom_component.common import (  # noqa: E402
+    async_fire_time_changed,
+)
+
+from custom_components.tplink_easy_smart.write_queue import (  # noqa: E402
+    TpLinkWriteQueue,
+)
+
+
+class _Writer:
+    """Records the values of every call."""
+
+    def __init__(self, error: Exception | None = None) -> None:
+        self.calls: list[list] = []
+        self._error = error
+
+    async def __call__(self, values: list) -> None:
+        self.calls.append(values)
+        if self._error:
+            raise self._error
+
+
+async def test_last_value_wins(hass: HomeAssistant) -> None:
+    queue = TpLinkWriteQueue(hass, 1.0)
+    writer = _Writer()
+
+    first = queue.async_enqueue(1, "on", writer)
+    second = queue.async_enqueue(1, "off", writer)
+    await queue.async_flush()
+
+    assert writer.calls == [["off"]]
+    assert second.result() is None
+    assert first.result() is None
+
+
+async def test_batches_by_writer_and_group(hass: HomeAssistant) -> None:
+    queue = TpLinkWriteQueue(hass, 1.0)
+    writer = _Writer()
+    other_writer = _Writer()
+
+    queue.async_enqueue(1, "a", writer, "group")
+    queue.async_enqueue(2, "b", writer, "group")
+    queue.async_enqueue(3, "c", writer, "other group")
+    queue.async_enqueue(4, "d", other_writer, "group")
+    await queue.async_flush()
+
+    assert sorted(writer.calls) == [["a", "b"], ["c"]]
+    assert other_writer.calls == [["d"]]
+
+
+async def test_error_is_passed_to_superseded_writes(hass: HomeAssistant) -> None:
+    queue = TpLinkWriteQueue(hass, 1.0)
+    writer = _Writer(RuntimeError("failed"))
+
+    first = queue.async_enqueue(1, "on", writer)
+    second = queue.async_enqueue(1, "off", writer)
+    await queue.async_flush()
+
+    assert isinstance(second.exception(), RuntimeError)
+    assert isinstance(first.exception(), RuntimeError)
+
+
+async def test_flush_after_delay(hass: HomeAssistant) -> None:
+    queue = TpLinkWriteQueue(hass, 1.0)
+    writer = _Writer()
+
+    future = queue.async_enqueue(1, "on", writer)
+    queue.async_enqueue(2, "off", writer)
+    await hass.async_block_till_done()
+
+    assert writer.calls == []
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=2))
+    await hass.async_block_till_done()
+
+    assert writer.calls == [["on", "off"]]
+    assert future.done()